@@ -9,8 +9,9 @@ import hashlib
 import json
 import time
 import threading
-from typing import List, Dict, Optional, Any, Union
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Union, Iterator
+from dataclasses import dataclass, asdict, field
 from decimal import Decimal, getcontext
 import logging
 import requests
@@ -23,7 +24,7 @@ from .database import DinariLevelDB
 getcontext().prec = 28
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """DinariBlockchain transaction (paid in DINARI gas)"""
     from_address: str
@@ -37,6 +38,7 @@ class Transaction:
     timestamp: int = 0
     tx_type: str = "transfer"  # transfer, contract_deploy, contract_call
     contract_address: str = ""
+    _hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.timestamp == 0:
@@ -58,8 +60,16 @@ class Transaction:
         }
 
     def get_hash(self) -> str:
-        """Calculate transaction hash"""
-        tx_string = f"{self.from_address}{self.to_address}{self.amount}{self.nonce}{self.timestamp}{self.data}"
+        """Calculate transaction hash (cached - hashed fields are fixed once created)"""
+        if self._hash is None:
+            tx_string = f"{self.from_address}{self.to_address}{self.amount}{self.nonce}{self.timestamp}{self.data}"
+            self._hash = "DTx" + hashlib.sha256(tx_string.encode()).hexdigest()
+        return self._hash
+
+    @staticmethod
+    def hash_dict(tx: dict) -> str:
+        """get_hash() of a stored transaction dict (to_dict() output, which omits the hash)"""
+        tx_string = f"{tx.get('from_address', '')}{tx.get('to_address', '')}{tx.get('amount', 0)}{tx.get('nonce', 0)}{tx.get('timestamp', 0)}{tx.get('data', '')}"
         return "DTx" + hashlib.sha256(tx_string.encode()).hexdigest()
 
 
@@ -652,6 +662,16 @@ class DinariBlockchain:
         self.logger = logging.getLogger("Dinari.blockchain")
         # Initialize LevelDB FIRST
         self.db = DinariLevelDB(db_path)
+
+        # Decoded blocks by height - committed blocks are immutable, so entries
+        # only need dropping when a height is (re)written
+        self._block_cache = OrderedDict()
+        self._block_cache_size = 512
+        self._block_cache_lock = threading.Lock()
+        
+        # Serializes the read-modify-write of tx_count and the per-address
+        # counters - blocks can be stored by the miner and the API at once
+        self._tx_index_lock = threading.RLock()
         
         # THEN create transaction indices
         self.create_transaction_indices()
@@ -674,6 +694,10 @@ class DinariBlockchain:
         if self.chain_state["height"] == 0:
             self._create_genesis_block()
         
+        # Index chains committed before permanent tx storage, before mining
+        # starts, so lookups never fall back to scanning blocks per request
+        self._backfill_transaction_index()
+        
         # Ensure we have validators and start mining
         self._ensure_validators()
         self.start_automatic_mining(15)
@@ -698,58 +722,114 @@ class DinariBlockchain:
             # Create index counters if they don't exist
             if not self.db.get('tx_count'):
                 self.db.put('tx_count', '0')
+
+            # Backfill the per-address index for transactions stored before it existed
+            self._backfill_address_index()
                         
             print("✅ Transaction indices initialized")
         except Exception as e:
             print(f"❌ Error creating transaction indices: {e}")
+
+    def _backfill_transaction_index(self):
+        """Store permanent tx records for a chain whose blocks predate them"""
+        height = self.chain_state.get("height", 0)
+        if height == 0 or int(self.db.get('tx_count') or '0') > 0:
+            return
+
+        self.logger.info("Indexing transactions of %d existing blocks", height)
+        with self.db.deferred_save():
+            for block_number in range(height):
+                block = self.get_block_by_index(block_number)
+                if not block:
+                    continue
+                for position, tx in enumerate(block.get('transactions', [])):
+                    tx_dict = dict(tx)
+                    if not tx_dict.get('hash'):
+                        tx_dict['hash'] = Transaction.hash_dict(tx_dict)
+                    self.store_transaction_permanently(tx_dict, block_number, position)
+
+    def _append_address_index(self, transaction, block_number, tx_index, tx_hash):
+        """Append a [block_number, tx_index, tx_hash] entry for the sender and
+        recipient as addridx:{address}:{seq:010d}, bumping addridx:{address}:count,
+        so each write is O(1) and a history page reads only its own entries"""
+        entry = [block_number, tx_index, tx_hash]
+        with self._tx_index_lock:
+            for addr in {transaction.get('from_address'), transaction.get('to_address')}:
+                if addr:
+                    count_key = f"addridx:{addr}:count"
+                    seq = int(self.db.get(count_key) or 0)
+                    self.db.put(f"addridx:{addr}:{seq:010d}", entry)
+                    self.db.put(count_key, seq + 1)
+            self.db.put('addridx:indexed', tx_index + 1)
+
+    def _backfill_address_index(self):
+        """Index transactions committed before the per-address index existed"""
+        with self._tx_index_lock, self.db.deferred_save():
+            tx_count = int(self.db.get('tx_count') or '0')
+            indexed = int(self.db.get('addridx:indexed') or 0)
+            for tx_index in range(indexed, tx_count):
+                record = self.db.get(f"tx:index:{tx_index:010d}")
+                if isinstance(record, str):
+                    record = json.loads(record)
+                if record:
+                    self._append_address_index(record, record.get('block_number'), tx_index, record.get('hash'))
+            if indexed < tx_count:
+                self.db.put('addridx:indexed', tx_count)
     
-    def store_transaction_permanently(self, transaction, block_number):
-        """Store transaction permanently with multiple indices for fast retrieval"""
+    def store_transaction_permanently(self, transaction, block_number, block_position=None):
+        """Store transaction permanently with multiple indices for fast retrieval
+        (block_position: the transaction's index within its block, when known)"""
         try:
             tx_hash = transaction.get('hash')
             if not tx_hash:
                 print("❌ Transaction has no hash, cannot store")
                 return False
             
-            # Get current transaction count
-            tx_count = int(self.db.get('tx_count') or '0')
+            # tx_count and the address counters are read-modify-write
+            with self._tx_index_lock:
+                # Get current transaction count
+                tx_count = int(self.db.get('tx_count') or '0')
             
-            # Store transaction with multiple keys for different access patterns:
-            # 1. By hash (primary key) - for direct hash lookups
-            self.db.put(f"tx:hash:{tx_hash}", json.dumps({
-                'transaction': transaction,
-                'block_number': block_number,
-                'tx_index': tx_count,
-                'timestamp': transaction.get('timestamp', int(time.time()))
-            }))
-
-            # 2. By transaction index (for chronological pagination)
-            self.db.put(f"tx:index:{tx_count:010d}", json.dumps({
-                'hash': tx_hash,
-                'block_number': block_number,
-                'from_address': transaction.get('from_address'),
-                'to_address': transaction.get('to_address'),
-                'amount': transaction.get('amount'),
-                'timestamp': transaction.get('timestamp')
-            }))
-
-            # 3. By from_address (for address transaction history)
-            from_addr = transaction.get('from_address')
-            if from_addr:
-                self.db.put(f"tx:from:{from_addr}:{tx_count:010d}", tx_hash)
-
-            # 4. By to_address (for address transaction history)
-            to_addr = transaction.get('to_address')
-            if to_addr:
-                self.db.put(f"tx:to:{to_addr}:{tx_count:010d}", tx_hash)
-
-            # 5. By block number (for block transaction lookups)
-            self.db.put(f"tx:block:{block_number}:{tx_count:010d}", tx_hash)
-
-            # Update transaction count
-            self.db.put('tx_count', str(tx_count + 1))
+                # Store transaction with multiple keys for different access patterns:
+                # 1. By hash (primary key) - for direct hash lookups
+                self.db.put(f"tx:hash:{tx_hash}", json.dumps({
+                    'transaction': transaction,
+                    'block_number': block_number,
+                    'block_position': block_position,
+                    'tx_index': tx_count,
+                    'timestamp': transaction.get('timestamp', int(time.time()))
+                }))
+
+                # 2. By transaction index (for chronological pagination)
+                self.db.put(f"tx:index:{tx_count:010d}", json.dumps({
+                    'hash': tx_hash,
+                    'block_number': block_number,
+                    'from_address': transaction.get('from_address'),
+                    'to_address': transaction.get('to_address'),
+                    'amount': transaction.get('amount'),
+                    'timestamp': transaction.get('timestamp')
+                }))
+
+                # 3. By from_address (for address transaction history)
+                from_addr = transaction.get('from_address')
+                if from_addr:
+                    self.db.put(f"tx:from:{from_addr}:{tx_count:010d}", tx_hash)
+
+                # 4. By to_address (for address transaction history)
+                to_addr = transaction.get('to_address')
+                if to_addr:
+                    self.db.put(f"tx:to:{to_addr}:{tx_count:010d}", tx_hash)
+
+                # 5. By block number (for block transaction lookups)
+                self.db.put(f"tx:block:{block_number}:{tx_count:010d}", tx_hash)
+
+                # 6. Per-address history index (append-only, chronological)
+                self._append_address_index(transaction, block_number, tx_count, tx_hash)
+
+                # Update transaction count
+                self.db.put('tx_count', str(tx_count + 1))
             
-            print(f"✅ Stored transaction {tx_hash} permanently (index: {tx_count})")
+            self.logger.debug("Stored transaction %s permanently (index: %d)", tx_hash, tx_count)
             return True
             
         except Exception as e:
@@ -757,50 +837,55 @@ class DinariBlockchain:
             return False
     
 
+    def iter_transactions(self, start_index=0, limit=100, reverse=True) -> Iterator[dict]:
+        """Yield stored transactions one at a time (newest first by default),
+        reading each from the tx:index/tx:hash keys only when it is consumed"""
+        total_count = int(self.db.get('tx_count') or '0')
+        
+        # Calculate range
+        if reverse:
+            # Start from newest transactions
+            end_index = total_count - start_index
+            start_scan = max(0, end_index - limit)
+            indices = range(end_index - 1, start_scan - 1, -1)
+        else:
+            # Start from oldest transactions
+            end_scan = min(total_count, start_index + limit)
+            indices = range(start_index, end_scan)
+        
+        # Retrieve transactions (using string keys)
+        for i in indices:
+            try:
+                key = f"tx:index:{i:010d}"
+                data = self.db.get(key)
+                if data:
+                    tx_meta = json.loads(data) if isinstance(data, str) else json.loads(data.decode())
+                    
+                    # Get full transaction details (using string key)
+                    full_tx_data = self.db.get(f"tx:hash:{tx_meta['hash']}")
+                    if full_tx_data:
+                        full_tx = json.loads(full_tx_data) if isinstance(full_tx_data, str) else json.loads(full_tx_data.decode())
+                        yield dict(full_tx['transaction'], block_number=full_tx.get('block_number', 0))
+                    
+            except Exception as e:
+                print(f"Error retrieving transaction at index {i}: {e}")
+                continue
+
     def get_all_transactions(self, start_index=0, limit=100, reverse=True):
         """Get transactions with pagination - NEVER loses old transactions"""
         try:
-            transactions = []
-            
             # Get total transaction count (using string key)
             total_count = int(self.db.get('tx_count') or '0')
             
             if total_count == 0:
                 return {'transactions': [], 'total': 0, 'has_more': False}
             
-            # Calculate range
-            if reverse:
-                # Start from newest transactions
-                end_index = total_count - start_index
-                start_scan = max(0, end_index - limit)
-                indices = range(end_index - 1, start_scan - 1, -1)
-            else:
-                # Start from oldest transactions
-                end_scan = min(total_count, start_index + limit)
-                indices = range(start_index, end_scan)
-            
-            # Retrieve transactions (using string keys)
-            for i in indices:
-                try:
-                    key = f"tx:index:{i:010d}"
-                    data = self.db.get(key)
-                    if data:
-                        tx_meta = json.loads(data) if isinstance(data, str) else json.loads(data.decode())
-                        
-                        # Get full transaction details (using string key)
-                        full_tx_data = self.db.get(f"tx:hash:{tx_meta['hash']}")
-                        if full_tx_data:
-                            full_tx = json.loads(full_tx_data) if isinstance(full_tx_data, str) else json.loads(full_tx_data.decode())
-                            transactions.append(full_tx['transaction'])
-                        
-                except Exception as e:
-                    print(f"Error retrieving transaction at index {i}: {e}")
-                    continue
+            transactions = list(self.iter_transactions(start_index, limit, reverse))
             
             has_more = (reverse and start_index + limit < total_count) or \
                     (not reverse and start_index + len(transactions) < total_count)
             
-            print(f"Retrieved {len(transactions)} transactions from permanent storage")
+            self.logger.debug("Retrieved %d transactions from permanent storage", len(transactions))
             
             return {
                 'transactions': transactions,
@@ -963,11 +1048,13 @@ class DinariBlockchain:
         
         # Store by index for easy access
         self.db.put(f"block_index:0", block_hash)
+        self._forget_block(0)
         # STORE ALL GENESIS TRANSACTIONS PERMANENTLY - ADD THIS BLOCK  
-        for tx in genesis_transactions:
-            tx_dict = tx.to_dict()
-            tx_dict['hash'] = tx.get_hash()  # Ensure hash is included
-            self.store_transaction_permanently(tx_dict, 0)
+        with self.db.deferred_save():
+            for position, tx in enumerate(genesis_transactions):
+                tx_dict = tx.to_dict()
+                tx_dict['hash'] = tx.get_hash()  # Ensure hash is included
+                self.store_transaction_permanently(tx_dict, 0, position)
 
         # Update chain state
         self.chain_state["height"] = 1
@@ -988,7 +1075,31 @@ class DinariBlockchain:
         return self.chain_state.get("height", 0)
 
     def get_block_by_index(self, block_number):
-        """Get block by index number - NO ITERATOR VERSION"""
+        """Get block by index number - NO ITERATOR VERSION (LRU-cached)
+
+        The returned dict is shared with the cache and later callers: copy it
+        (and any transaction dict in it) before adding or changing fields."""
+        with self._block_cache_lock:
+            block_data = self._block_cache.get(block_number)
+            if block_data is not None:
+                self._block_cache.move_to_end(block_number)
+                return block_data
+
+        block_data = self._load_block_by_index(block_number)
+        if block_data:
+            with self._block_cache_lock:
+                self._block_cache[block_number] = block_data
+                while len(self._block_cache) > self._block_cache_size:
+                    self._block_cache.popitem(last=False)
+        return block_data
+
+    def _forget_block(self, block_number):
+        """Drop a cached block when its height is written"""
+        with self._block_cache_lock:
+            self._block_cache.pop(block_number, None)
+
+    def _load_block_by_index(self, block_number):
+        """Read block block_number from the database"""
         try:
             # Try to get hash from index mapping first
             block_hash = self.db.get(f"block_index:{block_number}")
@@ -1020,6 +1131,20 @@ class DinariBlockchain:
             print(f"Error getting block {block_number}: {e}")
             return None
 
+    def iter_blocks_desc(self, start: Optional[int] = None, limit: Optional[int] = None) -> Iterator[dict]:
+        """Yield blocks newest-first from `start` (default: chain tip), fetching lazily
+        so callers that stop early never touch older blocks"""
+        if start is None:
+            start = self.chain_state.get("height", 0) - 1
+        stop = -1 if limit is None else max(start - limit, -1)
+
+        for i in range(start, stop, -1):
+            block_data = self.get_block_by_index(i)
+            if isinstance(block_data, dict):
+                # Ensure block has proper index number (on a copy - the
+                # cached block is shared)
+                yield dict(block_data, number=i)
+
     def create_index_mapping_for_existing_blocks(self):
         """Create index mapping without using iterator"""
         try:
@@ -1043,6 +1168,7 @@ class DinariBlockchain:
             # Create index mappings for found blocks
             for block_number, block_hash in blocks_found:
                 self.db.put(f"block_index:{block_number}", block_hash)
+                self._forget_block(block_number)
                 print(f"Mapped block {block_number} -> {block_hash}")
             
             if blocks_found:
@@ -1172,11 +1298,14 @@ class DinariBlockchain:
             
             # Store by index
             self.db.put(f"block_index:{new_block.index}", block_hash)
+            self._forget_block(new_block.index)
             # STORE ALL TRANSACTIONS PERMANENTLY - ADD THIS BLOCK
-            for tx in transactions_to_include:
-                tx_dict = tx.to_dict()
-                tx_dict['hash'] = tx.get_hash()  # Ensure hash is included
-                self.store_transaction_permanently(tx_dict, new_block.index)
+            # (one file-store flush per block, not one per index write)
+            with self.db.deferred_save():
+                for position, tx in enumerate(transactions_to_include):
+                    tx_dict = tx.to_dict()
+                    tx_dict['hash'] = tx.get_hash()  # Ensure hash is included
+                    self.store_transaction_permanently(tx_dict, new_block.index, position)
 
             # Update chain state
             self.chain_state["height"] += 1
@@ -1304,6 +1433,19 @@ class DinariBlockchain:
             return afrocoin_contract.get_afc_balance(address)
         return Decimal("0")
 
+    def get_balances_bulk(self, addresses) -> Dict[str, tuple]:
+        """Get (DINARI, AFC) balances for several addresses in one pass"""
+        dinari_balances = self.dinari_balances
+        afc_balances = {}
+        afrocoin_contract = self.contracts.get("afrocoin_stablecoin")
+        if afrocoin_contract and afrocoin_contract.contract_type == "afrocoin_stablecoin":
+            afc_balances = afrocoin_contract.state.variables.get('balances', {})
+        return {
+            address: (Decimal(dinari_balances.get(address, "0")),
+                      Decimal(afc_balances.get(address, "0")))
+            for address in addresses
+        }
+
     def get_chain_info(self) -> dict:
         """Get blockchain information"""
         return {
@@ -1330,39 +1472,7 @@ class DinariBlockchain:
     def get_recent_blocks(self, limit: int = 15) -> List[dict]:
         """Get recent blocks from database - FIXED VERSION"""
         try:
-            blocks = []
-            current_height = self.chain_state.get("height", 0)
-            
-            # Get blocks by trying direct database access
-            for i in range(current_height - 1, max(0, current_height - limit - 1), -1):
-                try:
-                    # Try multiple key patterns to find blocks
-                    block_data = None
-                    
-                    # Try by index mapping first
-                    block_hash = self.db.get(f"block_index:{i}")
-                    if block_hash:
-                        block_data = self.db.get(f"block:{block_hash}")
-                    
-                    # Try direct key patterns if index mapping doesn't work
-                    if not block_data:
-                        possible_keys = [f"block_{i}", f"block:{i}", str(i)]
-                        for key in possible_keys:
-                            block_data = self.db.get(key)
-                            if block_data:
-                                break
-                    
-                    if block_data:
-                        # Ensure block has proper index number
-                        if isinstance(block_data, dict):
-                            block_data['number'] = i
-                            blocks.append(block_data)
-                        
-                except Exception as e:
-                    print(f"Error getting block {i}: {e}")
-                    continue
-            
-            return blocks
+            return list(self.iter_blocks_desc(limit=limit))
             
         except Exception as e:
             print(f"Error in get_recent_blocks: {e}")
@@ -1411,9 +1521,9 @@ class DinariBlockchain:
                 block_transactions = block.get('transactions', [])
                 for tx in block_transactions:
                     if tx.get('hash') == tx_hash:
-                        tx['block_number'] = block.get('number', block.get('index', 0))
-                        tx['block_hash'] = block.get('hash', '')
-                        return tx
+                        return dict(tx,
+                                    block_number=block.get('number', block.get('index', 0)),
+                                    block_hash=block.get('hash', ''))
             
             return None
             
@@ -1422,38 +1532,33 @@ class DinariBlockchain:
             return None
         
     def get_address_transactions(self, address, start_index=0, limit=50):
-        """Get all transactions for an address - permanent history"""
+        """Get all transactions for an address - permanent history (newest first)"""
         try:
+            total = int(self.db.get(f"addridx:{address}:count") or 0)
+
+            # Entries are chronological; page from the end for newest-first
+            end = max(total - start_index, 0)
+
             transactions = []
-            
-            # Get transactions where address is sender
-            for key, value in self.db.iterator(prefix=f"tx:from:{address}:".encode()):
-                tx_hash = value.decode()
-                tx_data = self.get_transaction_by_hash(tx_hash)
-                if tx_data:
-                    tx = tx_data['transaction']
-                    tx['direction'] = 'sent'
-                    transactions.append(tx)
-            
-            # Get transactions where address is recipient
-            for key, value in self.db.iterator(prefix=f"tx:to:{address}:".encode()):
-                tx_hash = value.decode()
-                tx_data = self.get_transaction_by_hash(tx_hash)
-                if tx_data:
-                    tx = tx_data['transaction']
-                    tx['direction'] = 'received'
-                    transactions.append(tx)
-            
-            # Sort by timestamp (newest first)
-            transactions.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
-            
-            # Apply pagination
-            paginated = transactions[start_index:start_index + limit]
-            
+            for seq in range(end - 1, max(end - limit, 0) - 1, -1):
+                entry = self.db.get(f"addridx:{address}:{seq:010d}")
+                if not entry:
+                    continue
+                block_number, _tx_index, tx_hash = entry
+                record = self.db.get(f"tx:hash:{tx_hash}")
+                if isinstance(record, str):
+                    record = json.loads(record)
+                if not record:
+                    continue
+                tx = dict(record['transaction'])
+                tx['block_number'] = block_number
+                tx['direction'] = 'sent' if tx.get('from_address') == address else 'received'
+                transactions.append(tx)
+
             return {
-                'transactions': paginated,
-                'total': len(transactions),
-                'has_more': len(transactions) > start_index + limit
+                'transactions': transactions,
+                'total': total,
+                'has_more': total > start_index + limit
             }
             
         except Exception as e:
@@ -1467,10 +1572,11 @@ class DinariBlockchain:
             
             # IMPORTANT: Store all transactions in this block permanently
             if 'transactions' in block:
-                for transaction in block['transactions']:
-                    self.store_transaction_permanently(transaction, block.get('index', 0))
+                with self.db.deferred_save():
+                    for position, transaction in enumerate(block['transactions']):
+                        self.store_transaction_permanently(transaction, block.get('index', 0), position)
             
-            print(f"✅ Block {block.get('index')} and its transactions stored permanently")
+            self.logger.debug("Block %s and its transactions stored permanently", block.get('index'))
             return True
             
         except Exception as e:
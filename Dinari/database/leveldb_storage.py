@@ -6,6 +6,8 @@ LevelDB-based storage for DinariBlockchain
 
 import json
 import logging
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 
@@ -25,6 +27,10 @@ class DinariLevelDB:
     def __init__(self, db_path: str = "./dinari_data"):
         self.db_path = db_path
         self.logger = logging.getLogger("Dinari.database")
+        # Open deferred_save() blocks; file-mode saves wait for the last one
+        self._defer_lock = threading.Lock()
+        self._defer_depth = 0
+        self._defer_pending = False
         
         if LEVELDB_AVAILABLE:
             try:
@@ -61,12 +67,33 @@ class DinariLevelDB:
     def _save_file_data(self):
         """Save data to file (for file storage mode)"""
         if self.storage_type == "file":
+            with self._defer_lock:
+                if self._defer_depth:
+                    self._defer_pending = True
+                    return
             try:
                 with open(self.data_file, 'w') as f:
                     json.dump(self.data, f, indent=2)
             except Exception as e:
                 self.logger.error(f"Failed to save data file: {e}")
     
+    @contextmanager
+    def deferred_save(self):
+        """Batch writes: in file mode the data file is rewritten once when the
+        outermost block exits instead of on every put/delete"""
+        with self._defer_lock:
+            self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            with self._defer_lock:
+                self._defer_depth -= 1
+                flush = not self._defer_depth and self._defer_pending
+                if flush:
+                    self._defer_pending = False
+            if flush:
+                self._save_file_data()
+    
     def put(self, key: str, value: Any) -> None:
         """Store a key-value pair"""
         try:
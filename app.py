@@ -8,13 +8,26 @@ import os
 import json
 import time
 import hashlib
-import time
 import logging
+import re
 import secrets
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from decimal import Decimal
+import functools
+import itertools
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson is optional - fall back to Flask's stdlib encoder without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 # Import DinariBlockchain components
 from Dinari import (
@@ -34,98 +47,357 @@ load_dotenv()
 setup_logging()
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+    
+    Decimal balances and other non-native values are encoded with str(),
+    matching the default provider. Anything orjson cannot encode (e.g.
+    integers beyond 64 bits) falls back to the stdlib encoder.
+    """
+    
+    _OPTIONS = orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+    
+    def _encode(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=self._OPTIONS)
+        except TypeError:
+            return super().dumps(obj).encode('utf-8')
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping a decode
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
 # Initialize Flask app
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for web frontend
 
 # Global variables
 blockchain_node = None
 blockchain = None
 contract_manager = None
+# blockchain_node.get_network_info, resolved once when the node is created
+node_network_info = None
 
 # Configuration
 PORT = int(os.getenv('PORT', 5000))  # Render.com sets PORT
 NODE_ID = os.getenv('NODE_ID', 'api_node')
 
+# Transaction defaults - amounts stay in Decimal DINARI to match the ledger
+DEFAULT_GAS_PRICE = Decimal('0.001')
+DEFAULT_GAS_LIMIT = 21000
+DEFAULT_GAS_FEE = DEFAULT_GAS_PRICE * DEFAULT_GAS_LIMIT  # What _validate_transaction charges
+_ZERO = Decimal('0')
+MAX_BULK_TRANSACTIONS = int(os.getenv('MAX_BULK_TRANSACTIONS', 100))
+MAX_RPC_BATCH_SIZE = int(os.getenv('MAX_RPC_BATCH_SIZE', 100))
+TX_SCAN_WINDOW = int(os.getenv('DINARI_TX_SCAN_WINDOW', 1000))  # Blocks read when tx storage is empty
+
+# Decimals are immutable, so parsed request strings ("1", "0.001", ...) can be shared
+_dec_from_str = functools.lru_cache(maxsize=512)(Decimal)
+
+def _to_dec(value) -> Decimal:
+    """
+    Coerce a request amount to Decimal without a needless str() round trip
+    
+    Floats still go through str() so 0.1 becomes Decimal('0.1') rather
+    than its binary expansion; bools are rejected the same way as before.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, str):
+        return _dec_from_str(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
+    return _dec_from_str(str(value))
+
+# start_port -> port chosen by find_available_port in this process
+# (forked workers inherit it, so they don't probe again)
+_resolved_p2p_ports = {}
+
 # Find available P2P port to avoid conflicts
 def find_available_port(start_port: int = 8333) -> int:
-    """Find an available port starting from start_port"""
+    """
+    Find an available port starting from start_port
+    
+    The probe sets SO_REUSEADDR like the P2P server socket does, so a port
+    still in TIME_WAIT from the previous run is reused rather than skipped.
+    The chosen port is remembered per start_port for the life of the process.
+    """
     import socket
+    
+    resolved = _resolved_p2p_ports.get(start_port)
+    if resolved is not None:
+        return resolved
+    
+    def _probe(port):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind(('localhost', port))
+            return s.getsockname()[1]
+    
+    chosen = None
     for port in range(start_port, start_port + 100):
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
+            chosen = _probe(port)
+            break
         except OSError:
             continue
-    return start_port  # Fallback to original port
+    
+    if chosen is None:
+        # Whole range busy: let the kernel pick a free port
+        try:
+            chosen = _probe(0)
+        except OSError:
+            return start_port  # Fallback to original port
+    
+    _resolved_p2p_ports[start_port] = chosen
+    return chosen
 
 P2P_PORT = find_available_port(int(os.getenv('P2P_PORT', 8333)))
 
+class ChainInfoCache:
+    """
+    Short-lived cache of blockchain.get_chain_info()
+    
+    Info endpoints (/health, /api/blockchain/info, dinari_getBlockchainInfo)
+    share one snapshot that is refreshed at most once per max_age seconds.
+    Staleness below the block time is acceptable for these endpoints.
+    """
+    
+    def __init__(self, max_age: float = 0.25):
+        self.max_age = max_age
+        self.value = None
+        self.fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _is_fresh(self, max_age: float) -> bool:
+        return self.value is not None and time.monotonic() - self.fetched_at < max_age
+    
+    def get(self, max_age: float = None) -> dict:
+        """Return cached chain info, refreshing it if older than max_age"""
+        if max_age is None:
+            max_age = self.max_age
+        
+        if self._is_fresh(max_age):
+            return self.value
+        
+        with self._lock:
+            # Another request may have refreshed while we waited for the lock
+            if not self._is_fresh(max_age):
+                self.value = blockchain.get_chain_info()
+                self.fetched_at = time.monotonic()
+            return self.value
+    
+    def invalidate(self):
+        """Force the next get() to re-read chain info"""
+        self.fetched_at = 0.0
+
+chain_info_cache = ChainInfoCache(float(os.getenv('CHAIN_INFO_MAX_AGE', 0.25)))
+
+class TTLCache:
+    """
+    Small thread-safe key/value cache with per-entry expiry
+    
+    Entries expire ttl seconds after being stored; once maxsize is reached
+    the oldest entry is evicted. Hand-rolled so the API server does not
+    need cachetools for a handful of read-mostly lookups.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 2.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return default
+            return entry[1]
+    
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entry when full"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key):
+        """Drop key so the next get() misses"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+# Contract metadata for dinari_getContractInfo - dropped on calls/deploys
+contract_info_cache = TTLCache(maxsize=1024, ttl=float(os.getenv('CONTRACT_INFO_TTL', 2.0)))
+
+# Results of read-only RPC handlers that only change when a block is added
+rpc_height_cache = TTLCache(maxsize=1024, ttl=float(os.getenv('RPC_CACHE_TTL', 5.0)))
+
+# Formatted transactions of committed blocks for dinari_getBlockTransactions
+block_tx_cache = TTLCache(maxsize=256, ttl=float(os.getenv('BLOCK_TX_CACHE_TTL', 300.0)))
+
+# tx hash -> position within a block, keyed by block hash (committed blocks never change)
+block_tx_index_cache = TTLCache(maxsize=1024, ttl=float(os.getenv('BLOCK_TX_CACHE_TTL', 300.0)))
+
+def cached_by_height(handler):
+    """
+    Memoize a handle_dinari_* function per (params, chain height)
+    
+    A new block changes the key, so entries never outlive the data they
+    were built from; the TTL only bounds memory. Failures are not cached.
+    """
+    @functools.wraps(handler)
+    def wrapper(params):
+        if not blockchain:
+            return handler(params)
+        try:
+            key = (handler.__name__, json.dumps(params, sort_keys=True), blockchain.get_chain_height())
+        except (TypeError, ValueError):
+            return handler(params)
+        
+        result = rpc_height_cache.get(key)
+        if result is None:
+            result = handler(params)
+            if not result.get("success"):
+                return result
+            rpc_height_cache.set(key, result)
+        # Callers may add or replace top-level keys; the cached entry must not change
+        return dict(result)
+    return wrapper
+
+# Dual token status is canonical protocol data; only last_updated changes
+_DUAL_TOKEN_STATUS = {
+    "dinari": {
+        "symbol": "DINARI",
+        "name": "Dinari Native Token",
+        "price_usd": "1.00",  # Canonical price authority
+        "supply_circulating": "1930000",  # Current known value
+        "supply_max": "100000000",  # 100M max supply
+        "decimals": 18,
+        "contract_type": "native",
+        "oracle_status": "active",
+        "use_case": "gas_fees_governance"
+    },
+    "afc": {
+        "symbol": "AFC", 
+        "name": "Afrocoin Stablecoin",
+        "price_usd": "1.00",  # Canonical price authority
+        "supply_circulating": "200000000",  # 200M supply
+        "supply_max": "200000000",  # 200M max supply
+        "decimals": 18,
+        "contract_type": "stablecoin",
+        "contract_address": "afrocoin_stablecoin",
+        "oracle_status": "active",
+        "peg_mechanism": "dinari_collateral",
+        "use_case": "payments_transfers"
+    },
+    "price_authority": {
+        "canonical_source": "dinari_protocol",
+        "dinari_price_feed": "1.00",
+        "afc_price_feed": "1.00", 
+        "external_markets_follow": True,
+        "oracle_update_frequency": "60_seconds"
+    },
+    "network_stats": {
+        "block_height": 38,  # Current known value
+        "total_validators": 3,
+        "total_contracts": 1,
+        "total_transactions": 5,
+        "mining_active": True
+    },
+    "dual_oracle_active": True,
+    "protocol_version": "1.0.0"
+}
+
 def handle_dinari_getDualTokenStatus(params):
     """Get dual token (DINARI + AFC) status and canonical prices"""
     try:
-        # Get current timestamp
-        from datetime import datetime
-        current_time = datetime.utcnow().isoformat() + 'Z'
-        
-        # Build dual token status response with current known values
-        dual_status = {
-            "dinari": {
-                "symbol": "DINARI",
-                "name": "Dinari Native Token",
-                "price_usd": "1.00",  # Canonical price authority
-                "supply_circulating": "1930000",  # Current known value
-                "supply_max": "100000000",  # 100M max supply
-                "decimals": 18,
-                "contract_type": "native",
-                "oracle_status": "active",
-                "use_case": "gas_fees_governance"
-            },
-            "afc": {
-                "symbol": "AFC", 
-                "name": "Afrocoin Stablecoin",
-                "price_usd": "1.00",  # Canonical price authority
-                "supply_circulating": "200000000",  # 200M supply
-                "supply_max": "200000000",  # 200M max supply
-                "decimals": 18,
-                "contract_type": "stablecoin",
-                "contract_address": "afrocoin_stablecoin",
-                "oracle_status": "active",
-                "peg_mechanism": "dinari_collateral",
-                "use_case": "payments_transfers"
-            },
-            "price_authority": {
-                "canonical_source": "dinari_protocol",
-                "dinari_price_feed": "1.00",
-                "afc_price_feed": "1.00", 
-                "external_markets_follow": True,
-                "oracle_update_frequency": "60_seconds"
-            },
-            "network_stats": {
-                "block_height": 38,  # Current known value
-                "total_validators": 3,
-                "total_contracts": 1,
-                "total_transactions": 5,
-                "mining_active": True
-            },
-            "dual_oracle_active": True,
-            "protocol_version": "1.0.0",
-            "last_updated": current_time
-        }
+        # Get current timestamp (UTC, ISO 8601)
+        current_time = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        
+        # Shallow copy - the nested sections are shared and never mutated
+        dual_status = dict(_DUAL_TOKEN_STATUS, last_updated=current_time)
         
         return {"success": True, "data": dual_status}
         
     except Exception as e:
         return {"success": False, "error": f"Failed to get dual token status: {str(e)}"}
 
+# Row defaults for block/transaction listings
+_GAS_LIMIT_DEFAULT = '21000'
+_ZERO_STR = '0'
+_VALIDATOR_SYSTEM = 'system'
+
+def _str_field(record, key, default):
+    """
+    record[key] as a string, or default when missing
+    
+    Stored amounts and gas prices are already strings (Transaction.to_dict),
+    so only non-string values such as gas_limit pay for a str() call.
+    """
+    value = record.get(key)
+    if value is None:
+        return default
+    return value if value.__class__ is str else str(value)
+
+# DTx hash of a stored transaction dict, computed as Transaction.get_hash() does
+_derive_tx_hash = Transaction.hash_dict
+
+def _tx_hash(tx) -> str:
+    """Stored hash of tx, or the derived one - block transactions are stored without it"""
+    return tx.get('hash') or _derive_tx_hash(tx)
+
+def _block_tx_positions(block) -> dict:
+    """Map of tx hash -> position in block, hashed once per block"""
+    block_hash = block.get('hash')
+    positions = block_tx_index_cache.get(block_hash) if block_hash else None
+    if positions is None:
+        positions = {_tx_hash(tx): i for i, tx in enumerate(block.get('transactions', []))}
+        if block_hash:
+            block_tx_index_cache.set(block_hash, positions)
+    return positions
+
+def _json_size(obj) -> int:
+    """Size in bytes of obj's compact JSON encoding (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return len(orjson.dumps(obj, default=str))
+    return len(json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8'))
+
 def handle_dinari_getBlock(params):
-    """Get specific block by number or hash"""
+    """
+    Get specific block by number or hash
+    
+    Params: [block_id, full=True]. With full=false the transactions are
+    returned as a list of hashes instead of per-transaction objects.
+    """
     try:
         if not params or len(params) < 1:
             return {"success": False, "error": "Block identifier required"}
         
         block_id = params[0]
+        full = bool(params[1]) if len(params) > 1 else True
         
         if not blockchain:
             return {"success": False, "error": "Blockchain not available"}
@@ -152,23 +424,31 @@ def handle_dinari_getBlock(params):
         # Format block data
         transactions = block_data.get('transactions', [])
         
-        result = {
-            "number": block_data.get('number', 0),
-            "hash": block_data.get('hash'),
-            "timestamp": block_data.get('timestamp'),
-            "transactions": [
+        if full:
+            tx_list = [
                 {
-                    "hash": tx.get('hash', f"DTx{hash(str(tx)) & 0xffffffffffffffff:016x}"),
+                    "hash": _tx_hash(tx),
                     "from_address": tx.get('from_address'),
                     "to_address": tx.get('to_address'),
-                    "amount": str(tx.get('amount', 0)),
-                    "gas_limit": str(tx.get('gas_limit', 21000))
+                    "amount": _str_field(tx, 'amount', _ZERO_STR),
+                    "gas_limit": _str_field(tx, 'gas_limit', _GAS_LIMIT_DEFAULT)
                 }
                 for tx in transactions
-            ],
+            ]
+        else:
+            tx_list = [
+                _tx_hash(tx)
+                for tx in transactions
+            ]
+        
+        result = {
+            "number": block_data.get('number', 0),
+            "hash": block_data.get('hash'),
+            "timestamp": block_data.get('timestamp'),
+            "transactions": tx_list,
             "transaction_count": len(transactions),
-            "validator": block_data.get('validator', 'system'),
-            "size": len(json.dumps(block_data))
+            "validator": block_data.get('validator', _VALIDATOR_SYSTEM),
+            "size": _json_size(block_data)
         }
         
         return {"success": True, "data": result}
@@ -177,6 +457,14 @@ def handle_dinari_getBlock(params):
         return {"success": False, "error": f"Failed to get block: {str(e)}"}
 
 
+def _decode_record(value):
+    """Decode a storage value that was written as a pre-serialized JSON string"""
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
 def handle_dinari_getTransaction(params):
     """Get specific transaction by hash - PERMANENT LOOKUP"""
     try:
@@ -188,42 +476,63 @@ def handle_dinari_getTransaction(params):
         if not blockchain:
             return {"success": False, "error": "Blockchain not available"}
         
-        # Try permanent transaction storage first
-        if hasattr(blockchain, 'get_transaction_by_hash'):
-            result = blockchain.get_transaction_by_hash(tx_hash)
-            if result:
+        # Mined transactions: tx:hash:{hash} is written when the block is
+        # committed and already carries the block number - one key read
+        record = _decode_record(blockchain.db.get(f"tx:hash:{tx_hash}"))
+        if record:
+            tx = dict(record['transaction'])
+            tx.setdefault('block_number', record.get('block_number'))
+            return {
+                "success": True,
+                "data": tx
+            }
+        
+        # Pending transactions are stored under tx:{hash} on submit
+        pending = _decode_record(blockchain.db.get_transaction(tx_hash))
+        if pending:
+            return {
+                "success": True,
+                "data": dict(pending, hash=tx_hash, status="pending")
+            }
+        
+        # Fallback for blocks committed before the hash index existed: scan
+        # newest-first (recent txs are the ones queried), bounded by the window
+        for block_data in blockchain.iter_blocks_desc(limit=TX_SCAN_WINDOW):
+            position = _block_tx_positions(block_data).get(tx_hash)
+            if position is not None:
+                tx = block_data['transactions'][position]
                 return {
                     "success": True,
-                    "data": result['transaction']
+                    "data": dict(tx, hash=tx_hash, block_number=block_data['number'])
                 }
         
-        # Fallback: Search through all blocks (less efficient)
-        chain_height = blockchain.get_chain_height()
-        
-        for block_num in range(chain_height - 1, -1, -1):
-            try:
-                block_data = blockchain.get_block_by_index(block_num)
-                if not block_data:
-                    continue
-                
-                transactions = block_data.get('transactions', [])
-                for tx in transactions:
-                    if tx.get('hash') == tx_hash:
-                        return {
-                            "success": True,
-                            "data": tx
-                        }
-                        
-            except Exception as e:
-                continue
-        
         return {"success": False, "error": "Transaction not found"}
         
     except Exception as e:
-        print(f"ERROR in getTransaction: {e}")
+        logger.error("getTransaction failed: %s", e)
         return {"success": False, "error": str(e)}
 
 
+def _format_recent_tx(tx, now):
+    """Format one stored transaction for dinari_getRecentTransactions
+    (now: the caller's int(time.time()), used when the tx has no timestamp)"""
+    # Ensure DTx hash format
+    tx_hash = tx.get('hash', 'unknown')
+    if tx_hash != 'unknown' and not tx_hash.startswith('DTx'):
+        tx_hash = f"DTx{tx_hash.replace('0x', '')}"
+
+    return {
+        "hash": tx_hash,
+        "block_number": tx.get('block_number', 0),
+        "from_address": tx.get('from_address', 'unknown'),
+        "to_address": tx.get('to_address', 'unknown'),
+        "amount": _str_field(tx, 'amount', _ZERO_STR),
+        "gas_limit": _str_field(tx, 'gas_limit', _GAS_LIMIT_DEFAULT),
+        "gas_price": _str_field(tx, 'gas_price', _ZERO_STR),
+        "timestamp": tx.get('timestamp') or now,
+        "status": "success"
+    }
+
 def handle_dinari_getRecentTransactions(params):
     """Get ALL transactions with permanent storage - FIXED VERSION"""
     try:
@@ -238,49 +547,35 @@ def handle_dinari_getRecentTransactions(params):
         if hasattr(blockchain, 'get_all_transactions'):
             result = blockchain.get_all_transactions(start_index, limit, reverse=True)
             
-            # If no transactions in permanent storage, force rebuild
+            # Nothing in permanent storage: read the newest blocks directly and
+            # stop as soon as the requested page is filled (or the window ends)
             if result['total'] == 0:
-                print("🔧 Rebuilding transaction storage...")
-                chain_height = blockchain.get_chain_height()
-                for block_num in range(chain_height):
-                    try:
-                        block_data = blockchain.get_block_by_index(block_num)
-                        if block_data and 'transactions' in block_data:
-                            for tx in block_data['transactions']:
-                                # Ensure DTx hash
-                                if 'hash' not in tx or not tx['hash'].startswith('DTx'):
-                                    tx_string = f"{tx.get('from_address', '')}{tx.get('to_address', '')}{tx.get('amount', 0)}{tx.get('nonce', 0)}{tx.get('timestamp', 0)}{tx.get('data', '')}"
-                                    tx['hash'] = "DTx" + hashlib.sha256(tx_string.encode()).hexdigest()
-                                
-                                blockchain.store_transaction_permanently(tx, block_num)
-                    except Exception as e:
-                        continue
+                wanted = start_index + limit
+                collected = []
+                for block_data in blockchain.iter_blocks_desc(limit=TX_SCAN_WINDOW):
+                    for tx in reversed(block_data.get('transactions', [])):
+                        # Ensure DTx hash (on the copy - blocks come from a shared cache)
+                        tx_hash = tx.get('hash')
+                        if not tx_hash or not tx_hash.startswith('DTx'):
+                            tx_hash = _derive_tx_hash(tx)
+                        collected.append(dict(tx, hash=tx_hash, block_number=block_data['number']))
+                    if len(collected) > wanted:
+                        break
                 
-                # Try again after rebuild
-                result = blockchain.get_all_transactions(start_index, limit, reverse=True)
+                # collected stops at the requested page; the chain state
+                # carries the real number of committed transactions
+                total = chain_info_cache.get().get('total_transactions', 0)
+                result = {
+                    'transactions': collected[start_index:wanted],
+                    'total': max(total, len(collected)),
+                    'has_more': len(collected) > wanted
+                }
             
             if result['total'] > 0:
-                transactions = []
-                for tx in result['transactions']:
-                    # Ensure DTx hash format
-                    tx_hash = tx.get('hash', 'unknown')
-                    if tx_hash != 'unknown' and not tx_hash.startswith('DTx'):
-                        tx_hash = f"DTx{tx_hash.replace('0x', '')}"
-                    
-                    tx_info = {
-                        "hash": tx_hash,
-                        "block_number": tx.get('block_number', 0),
-                        "from_address": tx.get('from_address', 'unknown'),
-                        "to_address": tx.get('to_address', 'unknown'),
-                        "amount": str(tx.get('amount', 0)),
-                        "gas_limit": str(tx.get('gas_limit', 21000)),
-                        "gas_price": str(tx.get('gas_price', 0)),
-                        "timestamp": tx.get('timestamp', int(time.time())),
-                        "status": "success"
-                    }
-                    transactions.append(tx_info)
+                now = int(time.time())
+                transactions = [_format_recent_tx(tx, now) for tx in result['transactions']]
                 
-                print(f"✅ Returning {len(transactions)} transactions from permanent storage")
+                logger.debug("Returning %d transactions from permanent storage", len(transactions))
                 return {
                     "success": True,
                     "transactions": transactions,
@@ -289,43 +584,44 @@ def handle_dinari_getRecentTransactions(params):
                 }
         
         # Fallback to block scanning if permanent storage fails
-        print("📦 Falling back to block scanning")
+        logger.warning("Permanent transaction storage unavailable")
         return {"success": False, "error": "Permanent storage not working, check console"}
         
     except Exception as e:
-        print(f"❌ ERROR in getRecentTransactions: {e}")
+        logger.error("getRecentTransactions failed: %s", e)
         return {"success": False, "error": str(e)}
     
 def test_blockchain_methods():
     """Debug what blockchain methods return"""
     try:
-        print("=== BLOCKCHAIN DEBUG ===")
+        logger.debug("=== BLOCKCHAIN DEBUG ===")
         
         # Test chain height (this works for blocks)
         chain_height = blockchain.get_chain_height()
-        print(f"Chain height: {chain_height}")
+        logger.debug("Chain height: %s", chain_height)
         
         # Test what get_recent_transactions returns
         recent_txs = blockchain.get_recent_transactions(5)
-        print(f"get_recent_transactions() returned: {len(recent_txs) if recent_txs else 0} transactions")
+        logger.debug("get_recent_transactions() returned: %d transactions", len(recent_txs) if recent_txs else 0)
         
         if recent_txs:
-            print(f"First transaction: {recent_txs[0]}")
-            print(f"Is this genesis data? {recent_txs[0].get('from_address') == 'genesis'}")
+            logger.debug("First transaction: %s", recent_txs[0])
+            logger.debug("Is this genesis data? %s", recent_txs[0].get('from_address') == 'genesis')
         
         # Test getting a real block and its transactions
         if chain_height > 0:
             block_data = blockchain.get_block_by_index(chain_height - 1)  # Latest block
             if block_data:
                 block_txs = block_data.get('transactions', [])
-                print(f"Latest block ({chain_height-1}) has {len(block_txs)} transactions")
+                logger.debug("Latest block (%d) has %d transactions", chain_height - 1, len(block_txs))
                 if block_txs:
-                    print(f"Block transaction example: {block_txs[0]}")
+                    logger.debug("Block transaction example: %s", block_txs[0])
                     
     except Exception as e:
-        print(f"Debug error: {e}")
+        logger.debug("Debug error: %s", e)
 
 
+@cached_by_height
 def handle_dinari_getRecentBlocks(params):
     """Get recent blocks - REAL DATA VERSION"""
     try:
@@ -340,15 +636,16 @@ def handle_dinari_getRecentBlocks(params):
         if real_blocks:
             # Format real blocks for frontend
             formatted_blocks = []
+            now = int(time.time())
             for block in real_blocks:
                 block_info = {
                     "number": block.get('number', block.get('index', 0)),
-                    "hash": str(block.get('hash', f'0x{block.get("number", 0):064x}')),
-                    "timestamp": int(block.get('timestamp', time.time())),
+                    "hash": _str_field(block, 'hash', None) or f'0x{block.get("number", 0):064x}',
+                    "timestamp": int(block.get('timestamp') or now),
                     "transaction_count": len(block.get('transactions', [])),
-                    "gas_used": str(block.get('gas_used', 0)),
-                    "validator": str(block.get('validator', 'system')),
-                    "size": len(str(block)) if block else 512
+                    "gas_used": _str_field(block, 'gas_used', _ZERO_STR),
+                    "validator": _str_field(block, 'validator', _VALIDATOR_SYSTEM),
+                    "size": _json_size(block)
                 }
                 formatted_blocks.append(block_info)
             
@@ -364,10 +661,26 @@ def handle_dinari_getRecentBlocks(params):
             return {"success": False, "error": "No blocks found in database"}
         
     except Exception as e:
-        print(f"Error in getRecentBlocks: {e}")
+        logger.error("getRecentBlocks failed: %s", e)
         return {"success": False, "error": str(e)}
 
 
+def _block_tx_dict(tx, tx_index):
+    """Format one stored block transaction for dinari_getBlockTransactions"""
+    return {
+        "hash": _tx_hash(tx),
+        "transaction_index": tx_index,
+        "from_address": tx.get('from_address', 'unknown'),
+        "to_address": tx.get('to_address', 'unknown'),
+        "amount": _str_field(tx, 'amount', _ZERO_STR),
+        "gas_price": _str_field(tx, 'gas_price', '1000000000'),
+        "gas_limit": _str_field(tx, 'gas_limit', _GAS_LIMIT_DEFAULT),
+        "nonce": tx.get('nonce', 0),
+        "data": tx.get('data', ''),
+        "status": "success"
+    }
+
+
 def handle_dinari_getBlockTransactions(params):
     """Get all transactions in a specific block"""
     try:
@@ -379,52 +692,60 @@ def handle_dinari_getBlockTransactions(params):
         if not blockchain:
             return {"success": False, "error": "Blockchain not available"}
         
-        try:
-            if hasattr(blockchain, 'chain') and block_number < len(blockchain.chain):
-                block = blockchain.chain[block_number]
-            else:
-                return {"success": False, "error": f"Block {block_number} not found"}
-            
-            transactions = []
-            
-            if hasattr(block, 'transactions'):
-                for tx_index, tx in enumerate(block.transactions):
-                    # Generate hash if not available
-                    tx_hash = None
-                    if hasattr(tx, 'get_hash'):
-                        tx_hash = tx.get_hash()
-                    elif hasattr(tx, 'hash'):
-                        tx_hash = tx.hash
-                    else:
-                        tx_hash = f"0x{hash(f'{block_number}_{tx_index}_{str(tx)}'):064x}"
-                    
-                    tx_data = {
-                        "hash": tx_hash,
-                        "transaction_index": tx_index,
-                        "from_address": getattr(tx, 'from_address', 'unknown'),
-                        "to_address": getattr(tx, 'to_address', 'unknown'),
-                        "amount": str(getattr(tx, 'amount', '0')),
-                        "gas_price": str(getattr(tx, 'gas_price', '1000000000')),
-                        "gas_limit": str(getattr(tx, 'gas_limit', '21000')),
-                        "nonce": getattr(tx, 'nonce', 0),
-                        "data": getattr(tx, 'data', ''),
-                        "status": "success"
-                    }
-                    
-                    transactions.append(tx_data)
-            
-            return {"success": True, "data": {
-                "block_number": block_number,
-                "transactions": transactions,
-                "transaction_count": len(transactions)
-            }}
-            
-        except Exception as e:
-            return {"success": False, "error": f"Failed to get block transactions: {str(e)}"}
+        block = blockchain.get_block_by_index(block_number) if block_number >= 0 else None
+        if not block:
+            return {"success": False, "error": f"Block {block_number} not found"}
+        
+        # Committed blocks never change, so format each block's txs once;
+        # the hash in the key guards against a replaced block at this height
+        cache_key = (block_number, block.get('hash'))
+        transactions = block_tx_cache.get(cache_key)
+        if transactions is None:
+            transactions = tuple(
+                _block_tx_dict(tx, tx_index)
+                for tx_index, tx in enumerate(block.get('transactions', []))
+            )
+            block_tx_cache.set(cache_key, transactions)
+        
+        return {"success": True, "data": {
+            "block_number": block_number,
+            "transactions": list(transactions),
+            "transaction_count": len(transactions)
+        }}
         
     except Exception as e:
         return {"success": False, "error": f"Failed to get block transactions: {str(e)}"}
 
+# Gas price tiers used by dinari_estimateGas: (gas_price in wei, estimated time)
+_FEE_TIERS = {
+    "slow": ("1000000000", "30 seconds"),      # 1 Gwei
+    "standard": ("2000000000", "15 seconds"),  # 2 Gwei
+    "fast": ("5000000000", "5 seconds")        # 5 Gwei
+}
+
+@functools.lru_cache(maxsize=256)
+def _fee_totals(gas_limit: int) -> tuple:
+    """(tier, total_fee, total_fee_dinari) strings per tier for gas_limit
+    (memoized - only a few distinct limits occur; tuples can't be mutated)"""
+    totals = []
+    for tier, (gas_price, _estimated_time) in _FEE_TIERS.items():
+        total_fee = gas_limit * int(gas_price)
+        totals.append((tier, str(total_fee), str(total_fee / 1e18)))  # Convert to DINARI
+    return tuple(totals)
+
+def _fee_estimates(gas_limit: int) -> dict:
+    """Fee breakdown per tier for gas_limit - a fresh dict callers may modify"""
+    return {
+        tier: {
+            "gas_price": _FEE_TIERS[tier][0],
+            "gas_limit": str(gas_limit),
+            "total_fee": total_fee,
+            "total_fee_dinari": total_fee_dinari,
+            "estimated_time": _FEE_TIERS[tier][1]
+        }
+        for tier, total_fee, total_fee_dinari in _fee_totals(gas_limit)
+    }
+
 def handle_dinari_estimateGas(params):
     """Estimate gas cost for a transaction"""
     try:
@@ -439,11 +760,12 @@ def handle_dinari_estimateGas(params):
         amount = tx_params.get('amount', '0')
         data = tx_params.get('data', '')
         
-        # Validate addresses
-        if not from_address.startswith('DT') or len(from_address) != 42:
+        # Validate addresses (compiled DT regex, genesis addresses allowed)
+        is_valid = DinariAddress.is_valid_address
+        if not is_valid(from_address):
             return {"success": False, "error": "Invalid from_address format"}
         
-        if not to_address.startswith('DT') or len(to_address) != 42:
+        if not is_valid(to_address):
             return {"success": False, "error": "Invalid to_address format"}
         
         # Basic gas calculation
@@ -465,24 +787,8 @@ def handle_dinari_estimateGas(params):
         # Total gas estimate
         estimated_gas = base_gas + data_gas + contract_gas + afc_gas
         
-        # Gas price tiers
-        gas_prices = {
-            "slow": "1000000000",      # 1 Gwei - ~30 seconds
-            "standard": "2000000000",  # 2 Gwei - ~15 seconds  
-            "fast": "5000000000"       # 5 Gwei - ~5 seconds
-        }
-        
-        # Calculate fees for each tier
-        fee_estimates = {}
-        for tier, gas_price in gas_prices.items():
-            total_fee = int(estimated_gas) * int(gas_price)
-            fee_estimates[tier] = {
-                "gas_price": gas_price,
-                "gas_limit": str(estimated_gas),
-                "total_fee": str(total_fee),
-                "total_fee_dinari": str(total_fee / 1e18),  # Convert to DINARI
-                "estimated_time": "15 seconds" if tier == "standard" else ("30 seconds" if tier == "slow" else "5 seconds")
-            }
+        # Per-tier fees depend only on the gas limit
+        fee_estimates = _fee_estimates(estimated_gas)
         
         # Check if sender has enough DINARI for fees
         try:
@@ -491,7 +797,7 @@ def handle_dinari_estimateGas(params):
             
             max_fee = int(fee_estimates["fast"]["total_fee"])
             can_afford = int(float(dinari_balance) * 1e18) >= max_fee
-        except:
+        except (AttributeError, LookupError, TypeError, ValueError, ArithmeticError):
             can_afford = True  # Assume true if balance check fails
         
         result = {
@@ -505,7 +811,7 @@ def handle_dinari_estimateGas(params):
             "recommended": "standard",
             "can_afford_fees": can_afford,
             "estimated_gas": str(estimated_gas),
-            "current_gas_price": gas_prices["standard"],
+            "current_gas_price": _FEE_TIERS["standard"][0],
             "currency": "DINARI"
         }
         
@@ -515,33 +821,34 @@ def handle_dinari_estimateGas(params):
         return {"success": False, "error": f"Failed to estimate gas: {str(e)}"}
 
 
+# Dynamic gas pricing based on network congestion
+# For now, use static prices - can be made dynamic later
+_GAS_PRICE_TIERS = {
+    "slow": {
+        "price": "1000000000",      # 1 Gwei
+        "time": "30 seconds",
+        "probability": "95%"
+    },
+    "standard": {
+        "price": "2000000000",      # 2 Gwei
+        "time": "15 seconds", 
+        "probability": "98%"
+    },
+    "fast": {
+        "price": "5000000000",      # 5 Gwei
+        "time": "5 seconds",
+        "probability": "99%"
+    }
+}
+
 def handle_dinari_getCurrentGasPrices(params):
     """Get current network gas prices"""
     try:
-        # Dynamic gas pricing based on network congestion
-        # For now, use static prices - can be made dynamic later
-        
-        gas_prices = {
-            "slow": {
-                "price": "1000000000",      # 1 Gwei
-                "time": "30 seconds",
-                "probability": "95%"
-            },
-            "standard": {
-                "price": "2000000000",      # 2 Gwei
-                "time": "15 seconds", 
-                "probability": "98%"
-            },
-            "fast": {
-                "price": "5000000000",      # 5 Gwei
-                "time": "5 seconds",
-                "probability": "99%"
-            }
-        }
+        gas_prices = _GAS_PRICE_TIERS
         
         # Network statistics
         network_stats = {
-            "pending_transactions": len(blockchain.transaction_pool) if hasattr(blockchain, 'transaction_pool') else 0,
+            "pending_transactions": chain_info_cache.get().get('pending_transactions', 0) if blockchain else 0,
             "last_block_gas_used": "80%",  # Simulated
             "network_congestion": "low",    # low/medium/high
             "recommended_tier": "standard"
@@ -573,17 +880,16 @@ def handle_dinari_estimateTransactionFee(params):
         
         # Standard transaction gas
         gas_limit = 21000 if token_type == "DINARI" else 51000  # AFC uses more gas
-        gas_price = 2000000000  # 2 Gwei standard
-        
-        total_fee = gas_limit * gas_price
+        standard = _fee_estimates(gas_limit)["standard"]  # 2 Gwei standard
+        total_fee = int(standard["total_fee"])
         
         result = {
             "amount": amount,
             "token_type": token_type,
-            "gas_limit": str(gas_limit),
-            "gas_price": str(gas_price),
-            "total_fee": str(total_fee),
-            "total_fee_dinari": str(total_fee / 1e18),
+            "gas_limit": standard["gas_limit"],
+            "gas_price": standard["gas_price"],
+            "total_fee": standard["total_fee"],
+            "total_fee_dinari": standard["total_fee_dinari"],
             "fee_percentage": str((total_fee / (float(amount) * 1e18)) * 100) if float(amount) > 0 else "0"
         }
         
@@ -604,6 +910,9 @@ def handle_dinari_getTransactionHistory(params):
         limit = int(params[1]) if len(params) > 1 else 50
         start_index = int(params[2]) if len(params) > 2 else 0
         
+        if not DinariAddress.is_valid_address(address):
+            return {"success": False, "error": "Invalid address format"}
+        
         if not blockchain:
             return {"success": False, "error": "Blockchain not available"}
         
@@ -655,7 +964,7 @@ def handle_dinari_getTransactionHistory(params):
         }
         
     except Exception as e:
-        print(f"ERROR in getTransactionHistory: {e}")
+        logger.error("getTransactionHistory failed: %s", e)
         return {"success": False, "error": str(e)}
 
 
@@ -680,44 +989,79 @@ def handle_dinari_getTransactionDetails(params):
         
         tx_hash = params[0]
         
-        # Search for transaction by hash
-        for block_index in range(len(blockchain.chain) if hasattr(blockchain, 'chain') else 0):
-            try:
-                block = blockchain.get_block(block_index)
-                if not block:
-                    continue
-                    
-                for tx in block.get('transactions', []):
-                    if tx.get('hash') == tx_hash:
-                        # Found the transaction
-                        transaction_details = {
-                            "hash": tx.get('hash'),
-                            "from_address": tx.get('from_address'),
-                            "to_address": tx.get('to_address'),
-                            "amount": str(tx.get('amount', '0')),
-                            "gas_price": str(tx.get('gas_price', '0')),
-                            "gas_limit": str(tx.get('gas_limit', '21000')),
-                            "gas_used": str(tx.get('gas_limit', '21000')),  # Assume all gas used
-                            "status": "confirmed",
-                            "block_number": block_index,
-                            "block_hash": block.get('hash', ''),
-                            "block_timestamp": block.get('timestamp'),
-                            "transaction_index": 0,  # Position in block
-                            "nonce": tx.get('nonce', 0),
-                            "data": tx.get('data', ''),
-                            "confirmations": len(blockchain.chain) - block_index if hasattr(blockchain, 'chain') else 1
-                        }
-                        
-                        return {"success": True, "data": transaction_details}
-                        
-            except Exception as e:
-                continue
+        if not blockchain:
+            return {"success": False, "error": "Blockchain not available"}
+        
+        # Keyed lookups only: tx:hash:{hash} gives the block number, and the
+        # block itself is read through block_index:{n}
+        record = _decode_record(blockchain.db.get(f"tx:hash:{tx_hash}"))
+        if record:
+            tx = record['transaction']
+            block_index = record.get('block_number', 0)
+            block = blockchain.get_block_by_index(block_index) or {}
+            
+            # Records written before block_position was stored: locate the tx
+            # within its one block
+            position = record.get('block_position')
+            if position is None:
+                position = _block_tx_positions(block).get(tx_hash, 0)
+            
+            transaction_details = {
+                "hash": tx.get('hash', tx_hash),
+                "from_address": tx.get('from_address'),
+                "to_address": tx.get('to_address'),
+                "amount": _str_field(tx, 'amount', _ZERO_STR),
+                "gas_price": _str_field(tx, 'gas_price', _ZERO_STR),
+                "gas_limit": _str_field(tx, 'gas_limit', _GAS_LIMIT_DEFAULT),
+                "gas_used": _str_field(tx, 'gas_limit', _GAS_LIMIT_DEFAULT),  # Assume all gas used
+                "status": "confirmed",
+                "block_number": block_index,
+                "block_hash": block.get('hash', ''),
+                "block_timestamp": block.get('timestamp'),
+                "transaction_index": position,  # Position in block
+                "nonce": tx.get('nonce', 0),
+                "data": tx.get('data', ''),
+                "confirmations": max(blockchain.get_chain_height() - block_index, 1)
+            }
+            
+            return {"success": True, "data": transaction_details}
         
         return {"success": False, "error": "Transaction not found"}
         
     except Exception as e:
         return {"success": False, "error": f"Failed to get transaction details: {str(e)}"}
 
+# DT address layout - module-level so hot paths avoid class attribute lookups
+_DT_PREFIX = "DT"
+_HASH_LEN = 40                        # 160 bits = 40 hex chars
+_DT_LEN = len(_DT_PREFIX) + _HASH_LEN  # DT + 40 hex chars
+_HEX_BODY = re.compile(rf'[0-9a-fA-F]{{{_HASH_LEN}}}').fullmatch  # call with pos=len(_DT_PREFIX)
+
+def _derive_address(seed: str, legacy: bool = False) -> str:
+    """DT address for seed: BLAKE2b-160, or truncated SHA-256 when legacy"""
+    seed_bytes = seed.encode('utf-8')
+    digest_size = _HASH_LEN // 2  # 160 bits
+    
+    if legacy:
+        # Truncate the raw SHA-256 digest rather than its 64-char hex form
+        digest = hashlib.sha256(seed_bytes).digest()[:digest_size]
+    else:
+        digest = hashlib.blake2b(seed_bytes, digest_size=digest_size).digest()
+    
+    # Combine prefix with hash
+    return _DT_PREFIX + digest.hex()
+
+@functools.lru_cache(maxsize=4096)
+def _derive_public_address(seed: str) -> str:
+    """
+    Stable SHA-256 address for a wallet name or multisig key set
+    
+    These map to addresses users already hold, so they keep the original
+    derivation. Their inputs are public and re-requested on retries, so the
+    result is memoized; caller-supplied seeds are never cached.
+    """
+    return _derive_address(seed, legacy=True)
+
 class DinariAddress:
     """
     DinariBlockchain Address System with Genesis Compatibility
@@ -730,29 +1074,40 @@ class DinariAddress:
     Example: DT1a2b3c4d5e6f7g8h9i0j1k2l3m4n5o6p7q8r9s0t1u2
     
     - DT: Dinari Token prefix (2 chars)
-    - 40 chars: SHA-256 hash truncated to 160 bits (40 hex chars)
+    - 40 chars: 160-bit BLAKE2b hash (40 hex chars) for random addresses;
+      seeded, wallet-name and multisig addresses use SHA-256 truncated
+      to 160 bits
     - Case sensitive
     - Total length: 42 characters
     """
     
-    PREFIX = "DT"
-    ADDRESS_LENGTH = 42  # DT + 40 hex chars
-    HASH_LENGTH = 40     # 160 bits = 40 hex chars
+    PREFIX = _DT_PREFIX
+    ADDRESS_LENGTH = _DT_LEN
+    HASH_LENGTH = _HASH_LEN
     
     # Known genesis addresses that bypass strict validation
-    GENESIS_ADDRESSES = {
+    GENESIS_ADDRESSES = frozenset({
     "DT1qyfe883hey6jrgj2xvk9a3klghvz9z9way2nxvu",  # 30M DINARI - Main Treasury
     "DT1sv9m0g077juqa67h64zxzr26k5xu5rcp8c9qvx",   # 25M DINARI - Validators Fund  
     "DT1cqgze3fqpw0dqh9j8l2dqqyr89c0q5c2jdpg8x",   # 20M DINARI - Development Fund
     "DT1xz2f8l8lh8vqw3r6n4s2k7j9p1d5g8h3m6c4v7",   # 15M DINARI - Community Treasury
     "DT1a7b8c9d0e1f2g3h4i5j6k7l8m9n0o1p2q3r4s5"    # 10M DINARI - Reserve Fund
-    }
+    })
+    
+    # Check if address is a known genesis address - the frozenset's own
+    # membership test, so no Python frame per call
+    is_genesis_address = staticmethod(GENESIS_ADDRESSES.__contains__)
     
     @classmethod
     def generate_address(cls, seed: str = None) -> str:
         """
         Generate a new DinariBlockchain address (42 chars)
         
+        The hash is a one-way seed-to-address mapping with no signature
+        bound to it, so random addresses use the cheaper BLAKE2b. A supplied
+        seed keeps the original SHA-256 derivation so it always maps to the
+        address it was first issued.
+        
         Args:
             seed: Optional seed string. If None, uses secure random
             
@@ -761,38 +1116,32 @@ class DinariAddress:
         """
         if seed is None:
             # Generate secure random seed
-            seed = secrets.token_hex(32)
-        
-        # Create SHA-256 hash
-        hash_obj = hashlib.sha256(seed.encode('utf-8'))
-        hash_hex = hash_obj.hexdigest()
-        
-        # Take first 40 characters (160 bits)
-        address_hash = hash_hex[:cls.HASH_LENGTH]
-        
-        # Combine prefix with hash
-        address = f"{cls.PREFIX}{address_hash}"
+            return _derive_address(secrets.token_hex(32))
         
-        return address
+        return _derive_address(seed, legacy=True)
     
     @classmethod
     def generate_from_wallet_name(cls, wallet_name: str) -> str:
         """
         Generate deterministic address from wallet name
         
+        Always SHA-256, so a wallet name keeps the address it was issued.
+        
         Args:
             wallet_name: Name of the wallet
             
         Returns:
             DT-prefixed address
         """
-        return cls.generate_address(wallet_name)
+        return _derive_public_address(wallet_name)
     
     @classmethod
     def generate_multisig_address(cls, public_keys: list, threshold: int) -> str:
         """
         Generate a multisig address from multiple public keys
         
+        Always SHA-256, so a key set keeps the address it was issued.
+        
         Args:
             public_keys: List of public key strings
             threshold: Required signatures threshold
@@ -803,7 +1152,7 @@ class DinariAddress:
         # Sort public keys for deterministic address generation
         sorted_keys = sorted(public_keys)
         multisig_data = f"multisig_{threshold}_{','.join(sorted_keys)}"
-        return cls.generate_address(multisig_data)
+        return _derive_public_address(multisig_data)
     
     @classmethod
     def is_valid_address(cls, address: str) -> bool:
@@ -819,64 +1168,144 @@ class DinariAddress:
         if not isinstance(address, str):
             return False
         
-        if not address.startswith(cls.PREFIX):
-            return False
-        
-        # Allow known genesis addresses (legacy format)
-        if address in cls.GENESIS_ADDRESSES:
+        # Common case first: a new-format address is decided without
+        # touching the genesis set
+        if (len(address) == _DT_LEN and address.startswith(_DT_PREFIX)
+                and _HEX_BODY(address, len(_DT_PREFIX)) is not None):
             return True
         
-        # Strict validation for new addresses
-        if len(address) != cls.ADDRESS_LENGTH:
-            return False
-        
-        # Check if the hash part is valid hex
-        hash_part = address[len(cls.PREFIX):]
-        try:
-            int(hash_part, 16)
-            return len(hash_part) == cls.HASH_LENGTH
-        except ValueError:
-            return False
+        # Legacy genesis addresses are not pure hex and may have another length
+        return address in cls.GENESIS_ADDRESSES
     
     @classmethod
-    def is_genesis_address(cls, address: str) -> bool:
-        """Check if address is a known genesis address"""
-        return address in cls.GENESIS_ADDRESSES
+    def classify_address(cls, address: str) -> tuple:
+        """
+        Validate and classify an address with a single genesis-set lookup
+        
+        Returns:
+            (is_valid, is_genesis) - every genesis address is valid
+        """
+        if not isinstance(address, str):
+            return False, False
+        if address in cls.GENESIS_ADDRESSES:
+            return True, True
+        is_valid = (len(address) == _DT_LEN and address.startswith(_DT_PREFIX)
+                    and _HEX_BODY(address, len(_DT_PREFIX)) is not None)
+        return is_valid, False
     
     @classmethod
-    def get_genesis_addresses(cls) -> set:
-        """Get all known genesis addresses"""
-        return cls.GENESIS_ADDRESSES.copy()
+    def get_genesis_addresses(cls) -> frozenset:
+        """Get all known genesis addresses (immutable - no per-call copy)"""
+        return cls.GENESIS_ADDRESSES
     
     @classmethod
     def get_address_info(cls, address: str) -> dict:
-        """Get detailed information about an address"""
+        """
+        Get detailed information about an address
+        
+        Built once per address and memoized; each caller gets its own
+        (flat) copy, so adding fields never leaks into later responses.
+        """
+        if not isinstance(address, str):
+            return cls._build_address_info(address)
+        return dict(_cached_address_info(address))
+    
+    @classmethod
+    def _build_address_info(cls, address: str) -> dict:
+        is_valid, is_genesis = cls.classify_address(address)
         return {
             "address": address,
-            "is_valid": cls.is_valid_address(address),
-            "is_genesis": cls.is_genesis_address(address),
+            "is_valid": is_valid,
+            "is_genesis": is_genesis,
             "length": len(address),
             "prefix": address[:2] if len(address) >= 2 else "",
             "hash_part": address[2:] if len(address) > 2 else "",
             "expected_format": "DT + 40 hex characters",
-            "expected_length": cls.ADDRESS_LENGTH
+            "expected_length": _DT_LEN
         }
 
+# Address info is a pure function of the string; wallets and explorers
+# revalidate the same addresses on every call
+_cached_address_info = functools.lru_cache(maxsize=4096)(DinariAddress._build_address_info)
+
+# Genesis addresses and their info are invariant at runtime - build them
+# once at import and only attach the live balances per request
+_GENESIS_ADDRS = tuple(sorted(DinariAddress.GENESIS_ADDRESSES))
+_GENESIS_ADDRESS_INFO = tuple(
+    DinariAddress.get_address_info(address)
+    for address in _GENESIS_ADDRS
+)
+
+class GenesisFundingOrder:
+    """
+    Order in which genesis addresses are tried when funding an address
+    
+    Genesis addresses are kept sorted by last-known DINARI balance (largest
+    first) so a funding request normally needs a single balance read.
+    Balances only move when a block is applied, so the order is rebuilt
+    when the chain height changes, every refresh_interval seconds as a
+    backstop, or after a funding request found no usable address;
+    successful funders move to the front.
+    """
+    
+    def __init__(self, refresh_interval: float = 30.0):
+        self.refresh_interval = refresh_interval
+        self._order = []
+        self._height = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+    
+    def candidates(self) -> list:
+        """Genesis addresses in the order they should be tried"""
+        if (not self._order
+                or self._height != blockchain.get_chain_height()
+                or time.monotonic() - self._refreshed_at >= self.refresh_interval):
+            self.refresh()
+        return list(self._order)
+    
+    def refresh(self):
+        """Re-read genesis balances and rebuild the order"""
+        height = blockchain.get_chain_height()
+        try:
+            balances = {address: dinari for address, (dinari, _afc)
+                        in blockchain.get_balances_bulk(_GENESIS_ADDRS).items()}
+        except Exception:
+            balances = dict.fromkeys(_GENESIS_ADDRS, _ZERO)
+        
+        with self._lock:
+            self._order = sorted(balances, key=balances.get, reverse=True)
+            self._height = height
+            self._refreshed_at = time.monotonic()
+    
+    def promote(self, address: str):
+        """Move a genesis address that just funded a request to the front"""
+        with self._lock:
+            if address in self._order:
+                self._order.remove(address)
+                self._order.insert(0, address)
+    
+    def mark_stale(self):
+        """Force a rescan on the next funding request"""
+        self._refreshed_at = 0.0
+
+genesis_funding_order = GenesisFundingOrder()
+
 def initialize_blockchain():
     """Initialize blockchain and node"""
-    global blockchain_node, blockchain, contract_manager
+    global blockchain_node, blockchain, contract_manager, node_network_info
     
     try:
-        logger.info(f"🚀 Initializing DinariBlockchain API Server")
-        logger.info(f"   Node ID: {NODE_ID}")
-        logger.info(f"   P2P Port: {P2P_PORT}")
-        logger.info(f"   API Port: {PORT}")
-        logger.info(f"   Address Format: DT-prefixed addresses")
-        logger.info(f"   Genesis Compatibility: {len(DinariAddress.GENESIS_ADDRESSES)} known addresses")
+        logger.info("Initializing DinariBlockchain API Server")
+        logger.info("   Node ID: %s", NODE_ID)
+        logger.info("   P2P Port: %s", P2P_PORT)
+        logger.info("   API Port: %s", PORT)
+        logger.info("   Address Format: DT-prefixed addresses")
+        logger.info("   Genesis Compatibility: %d known addresses", len(DinariAddress.GENESIS_ADDRESSES))
         
         # Create blockchain instance first (auto-starts mining and validators)
         blockchain = DinariBlockchain()
-        #test_blockchain_methods()
+        if os.getenv('DINARI_DEBUG') == '1':
+            test_blockchain_methods()
         
         # Create contract manager
         contract_manager = ContractManager(blockchain)
@@ -889,37 +1318,72 @@ def initialize_blockchain():
                 node_id=NODE_ID
             )
             
+            node_network_info = getattr(blockchain_node, 'get_network_info', None)
+            
             # Set blockchain reference on node
             if hasattr(blockchain_node, 'set_blockchain'):
                 blockchain_node.set_blockchain(blockchain)
             
-            # Start node in background thread
-            def start_node():
-                try:
-                    if hasattr(blockchain_node, 'start'):
-                        blockchain_node.start()
-                    logger.info("✅ P2P Node started successfully")
-                except Exception as e:
-                    logger.warning(f"P2P Node failed to start (non-critical): {e}")
-                    logger.info("⚠️  API will work without P2P networking")
-            
-            # Start node in background
-            node_thread = threading.Thread(target=start_node, daemon=True)
-            node_thread.start()
+            # start() only binds the listener and hands it to the node's own
+            # daemon thread, so call it directly and check the result
+            try:
+                if hasattr(blockchain_node, 'start') and blockchain_node.start() is False:
+                    logger.warning("P2P Node failed to start (non-critical)")
+                    logger.info("API will work without P2P networking")
+                    blockchain_node = None
+                    node_network_info = None
+                else:
+                    logger.info("P2P Node started successfully")
+            except Exception as e:
+                logger.warning("P2P Node failed to start (non-critical): %s", e)
+                logger.info("API will work without P2P networking")
+                blockchain_node = None
+                node_network_info = None
             
         except Exception as e:
-            logger.warning(f"P2P Node initialization failed (non-critical): {e}")
-            logger.info("⚠️  Continuing with API-only mode")
+            logger.warning("P2P Node initialization failed (non-critical): %s", e)
+            logger.info("Continuing with API-only mode")
             blockchain_node = None
+            node_network_info = None
         
-        logger.info("✅ Blockchain initialized successfully")
-        logger.info(f"⚡ Automatic mining: {'ACTIVE' if blockchain.mining_active else 'INACTIVE'}")
-        logger.info(f"👥 Validators: {len(blockchain.validators)}")
+        logger.info("Blockchain initialized successfully")
+        logger.info("Automatic mining: %s", 'ACTIVE' if blockchain.mining_active else 'INACTIVE')
+        logger.info("Validators: %d", len(blockchain.validators))
         
     except Exception as e:
-        logger.error(f"❌ Failed to initialize blockchain: {e}")
+        logger.error("Failed to initialize blockchain: %s", e)
         raise
 
+_init_lock = threading.Lock()
+_initialized = False
+
+def ensure_blockchain_initialized():
+    """
+    Run initialize_blockchain() once per process
+    
+    Called by the gunicorn worker hook and, as a fallback, before the first
+    request - never at import, so a preloading master only loads code and
+    the mining threads, P2P socket and storage handles start in the worker.
+    A failed init is logged once and the API keeps serving without a chain.
+    """
+    global _initialized
+    if _initialized:
+        return
+    
+    with _init_lock:
+        if _initialized:
+            return
+        try:
+            initialize_blockchain()
+        except Exception as e:
+            logger.error("Failed to initialize for production: %s", e)
+        finally:
+            _initialized = True
+
+@app.before_request
+def _initialize_on_first_request():
+    ensure_blockchain_initialized()
+
 # Health check endpoint
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -938,7 +1402,7 @@ def health_check():
         
         if blockchain:
             try:
-                chain_info = blockchain.get_chain_info()
+                chain_info = chain_info_cache.get()
                 status.update({
                     'blockchain': {
                         'height': chain_info.get('height', 0),
@@ -949,12 +1413,12 @@ def health_check():
                     }
                 })
             except Exception as e:
-                logger.warning(f"Could not get blockchain info: {e}")
+                logger.warning("Could not get blockchain info: %s", e)
         
         if blockchain_node:
             try:
-                if hasattr(blockchain_node, 'get_network_info'):
-                    node_info = blockchain_node.get_network_info()
+                if node_network_info is not None:
+                    node_info = node_network_info()
                     status.update({
                         'network': {
                             'connected_peers': node_info.get('connected_peers', 0),
@@ -970,7 +1434,7 @@ def health_check():
                         }
                     })
             except Exception as e:
-                logger.warning(f"Could not get network info: {e}")
+                logger.warning("Could not get network info: %s", e)
                 status.update({
                     'network': {
                         'connected_peers': 0,
@@ -1000,7 +1464,7 @@ def blockchain_info():
         if not blockchain:
             return jsonify({'error': 'Blockchain not initialized'}), 503
         
-        chain_info = blockchain.get_chain_info()
+        chain_info = chain_info_cache.get()
         
         # Get AFC supply from Afrocoin contract
         afc_supply = "0"
@@ -1008,7 +1472,7 @@ def blockchain_info():
             afrocoin_contract = blockchain.get_afrocoin_contract()
             if afrocoin_contract:
                 afc_supply = afrocoin_contract.state.variables.get('total_supply', '0')
-        except:
+        except (AttributeError, LookupError):
             afc_supply = "200000000"  # Default to 200M if can't read from contract
         
         info = {
@@ -1042,7 +1506,8 @@ def get_balance(address):
             return jsonify({'error': 'Blockchain not initialized'}), 503
         
         # Validate DT address format (now supports genesis addresses)
-        if not DinariAddress.is_valid_address(address):
+        is_valid, is_genesis = DinariAddress.classify_address(address)
+        if not is_valid:
             return jsonify({'error': 'Invalid DT address format. Address must start with "DT" followed by 40 hex characters.'}), 400
         
         # Get DINARI balance
@@ -1055,12 +1520,10 @@ def get_balance(address):
         if hasattr(blockchain, 'get_afrocoin_balance'):
             afc_balance = str(blockchain.get_afrocoin_balance(address))
         
-        address_info = DinariAddress.get_address_info(address)
-        
         return jsonify({
             'address': address,
             'address_format': 'DT-prefixed',
-            'is_genesis': address_info['is_genesis'],
+            'is_genesis': is_genesis,
             'balances': {
                 'DINARI': dinari_balance,
                 'AFC': afc_balance
@@ -1070,49 +1533,108 @@ def get_balance(address):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _build_transaction(tx_data) -> Transaction:
+    """
+    Validate submitted transaction fields and build the Transaction
+    
+    All field checks and Decimal/int conversions happen here, before the
+    ledger is touched, so a bulk submit can reject bad input up front.
+    
+    Raises:
+        ValueError: If a field is missing or malformed
+    """
+    if not isinstance(tx_data, dict):
+        raise ValueError('Transaction must be an object')
+    
+    # Validate required fields
+    for field in ('from_address', 'to_address', 'amount'):
+        if field not in tx_data:
+            raise ValueError(f'Missing field: {field}')
+    
+    # Validate DT addresses (now supports genesis addresses)
+    is_valid = DinariAddress.is_valid_address
+    if not is_valid(tx_data['from_address']):
+        raise ValueError('Invalid from_address. Must be DT-prefixed address.')
+    
+    if not is_valid(tx_data['to_address']):
+        raise ValueError('Invalid to_address. Must be DT-prefixed address.')
+    
+    try:
+        return Transaction(
+            from_address=tx_data['from_address'],
+            to_address=tx_data['to_address'],
+            amount=_to_dec(tx_data['amount']),
+            gas_price=_to_dec(tx_data['gas_price']) if 'gas_price' in tx_data else DEFAULT_GAS_PRICE,
+            gas_limit=int(tx_data.get('gas_limit', DEFAULT_GAS_LIMIT)),
+            nonce=int(tx_data.get('nonce', 0)),
+            data=tx_data.get('data', '')
+        )
+    except (ArithmeticError, TypeError, ValueError):
+        raise ValueError('Invalid amount, gas_price, gas_limit or nonce')
+
+def _submit_transactions(items):
+    """Bulk submit for /api/blockchain/transaction"""
+    if not items:
+        return jsonify({'error': 'No transactions supplied'}), 400
+    
+    if len(items) > MAX_BULK_TRANSACTIONS:
+        return jsonify({'error': f'At most {MAX_BULK_TRANSACTIONS} transactions per request'}), 400
+    
+    # Reject the whole batch before anything reaches the pending pool
+    txs = []
+    for i, tx_data in enumerate(items):
+        try:
+            txs.append(_build_transaction(tx_data))
+        except ValueError as e:
+            return jsonify({'error': f'Transaction {i}: {e}'}), 400
+    
+    results = []
+    for tx in txs:
+        success = blockchain.add_transaction(tx)
+        results.append({
+            'success': success,
+            'transaction_hash': tx.get_hash()
+        })
+    
+    accepted = sum(1 for result in results if result['success'])
+    if accepted:
+        chain_info_cache.invalidate()
+    
+    return jsonify({
+        'success': accepted == len(results),
+        'accepted': accepted,
+        'rejected': len(results) - accepted,
+        'transactions': results
+    }), 200
+
 @app.route('/api/blockchain/transaction', methods=['POST'])
 def submit_transaction():
-    """Submit a new transaction"""
+    """Submit a new transaction, or a list of them under 'transactions'"""
     try:
         if not blockchain:
             return jsonify({'error': 'Blockchain not initialized'}), 503
         
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['from_address', 'to_address', 'amount']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing field: {field}'}), 400
-        
-        # Validate DT addresses (now supports genesis addresses)
-        if not DinariAddress.is_valid_address(data['from_address']):
-            return jsonify({'error': 'Invalid from_address. Must be DT-prefixed address.'}), 400
+        data = request.get_json(silent=True) or {}
         
-        if not DinariAddress.is_valid_address(data['to_address']):
-            return jsonify({'error': 'Invalid to_address. Must be DT-prefixed address.'}), 400
+        if isinstance(data, dict) and isinstance(data.get('transactions'), list):
+            return _submit_transactions(data['transactions'])
         
-        # Create transaction
-        tx = Transaction(
-            from_address=data['from_address'],
-            to_address=data['to_address'],
-            amount=Decimal(str(data['amount'])),
-            gas_price=Decimal(str(data.get('gas_price', '0.001'))),
-            gas_limit=int(data.get('gas_limit', 21000)),
-            nonce=int(data.get('nonce', 0)),
-            data=data.get('data', '')
-        )
+        try:
+            tx = _build_transaction(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Add transaction to blockchain
         success = blockchain.add_transaction(tx)
         
         if success:
+            chain_info_cache.invalidate()
             return jsonify({
                 'success': True,
                 'transaction_hash': tx.get_hash(),
                 'message': 'Transaction submitted successfully',
-                'from_genesis': DinariAddress.is_genesis_address(data['from_address']),
-                'to_genesis': DinariAddress.is_genesis_address(data['to_address'])
+                'from_genesis': DinariAddress.is_genesis_address(tx.from_address),
+                'to_genesis': DinariAddress.is_genesis_address(tx.to_address)
             }), 200
         else:
             return jsonify({'error': 'Failed to submit transaction'}), 400
@@ -1127,15 +1649,46 @@ def get_block(block_index):
         if not blockchain:
             return jsonify({'error': 'Blockchain not initialized'}), 503
         
-        chain_info = blockchain.get_chain_info()
-        if block_index >= chain_info.get('height', 0) or block_index < 0:
+        if block_index >= blockchain.get_chain_height() or block_index < 0:
             return jsonify({'error': 'Block not found'}), 404
         
-        # Try to get block by hash (would need implementation)
-        return jsonify({
-            'message': 'Block retrieval by index not yet implemented',
-            'available_height': chain_info.get('height', 0)
-        }), 501
+        # Served from DinariBlockchain's per-height block cache
+        block_data = blockchain.get_block_by_index(block_index)
+        if not block_data:
+            return jsonify({'error': 'Block not found'}), 404
+        
+        return jsonify(block_data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/blockchain/transactions/stream', methods=['GET'])
+def stream_transactions():
+    """
+    Stream stored transactions (newest first) as NDJSON
+    
+    Query: limit (default 100), start (offset from newest, default 0).
+    Each line is one transaction formatted like dinari_getRecentTransactions;
+    rows are read and encoded one at a time, so memory stays flat for any limit.
+    """
+    try:
+        if not blockchain:
+            return jsonify({'error': 'Blockchain not initialized'}), 503
+        
+        limit = max(request.args.get('limit', 100, type=int), 0)
+        start_index = max(request.args.get('start', 0, type=int), 0)
+        
+        if ORJSON_AVAILABLE:
+            encode = orjson.dumps
+        else:
+            encode = lambda obj: json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        
+        def generate():
+            now = int(time.time())
+            for tx in blockchain.iter_transactions(start_index, limit, reverse=True):
+                yield encode(_format_recent_tx(tx, now)) + b'\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1147,7 +1700,7 @@ def deploy_contract():
         if not contract_manager:
             return jsonify({'error': 'Contract manager not initialized'}), 503
         
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         
         required_fields = ['contract_id', 'owner']
         for field in required_fields:
@@ -1166,6 +1719,7 @@ def deploy_contract():
             contract_type=data.get('contract_type', 'general'),
             initial_state=data.get('initial_state', {})
         )
+        contract_info_cache.pop(data['contract_id'])
         
         return jsonify({
             'success': True,
@@ -1185,7 +1739,7 @@ def call_contract():
         if not contract_manager:
             return jsonify({'error': 'Contract manager not initialized'}), 503
         
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         
         required_fields = ['contract_id', 'function_name', 'caller']
         for field in required_fields:
@@ -1205,8 +1759,9 @@ def call_contract():
             contract_id=data['contract_id'],
             function_data=function_data,
             caller=data['caller'],
-            value=Decimal(str(data.get('value', '0')))
+            value=_to_dec(data.get('value', _ZERO))
         )
+        contract_info_cache.pop(data['contract_id'])
         
         return jsonify({
             'success': result.get('success', False),
@@ -1255,27 +1810,20 @@ def get_genesis_addresses():
     try:
         genesis_addresses = []
         
-        for address in DinariAddress.get_genesis_addresses():
-            address_info = DinariAddress.get_address_info(address)
-            
-            # Get balance if blockchain is available
-            dinari_balance = "0"
-            afc_balance = "0"
-            
-            if blockchain:
-                try:
-                    dinari_balance = str(blockchain.get_dinari_balance(address))
-                    afc_balance = str(blockchain.get_afrocoin_balance(address))
-                except:
-                    pass
-            
-            genesis_addresses.append({
-                **address_info,
-                'balances': {
-                    'DINARI': dinari_balance,
-                    'AFC': afc_balance
-                }
-            })
+        # Get balances (one bulk read) if blockchain is available
+        balances = {}
+        if blockchain:
+            try:
+                balances = blockchain.get_balances_bulk(_GENESIS_ADDRS)
+            except Exception:
+                balances = {}
+        
+        for address_info in _GENESIS_ADDRESS_INFO:
+            dinari_balance, afc_balance = balances.get(address_info['address'], ("0", "0"))
+            genesis_addresses.append(dict(address_info, balances={
+                'DINARI': str(dinari_balance),
+                'AFC': str(afc_balance)
+            }))
         
         return jsonify({
             'total_genesis_addresses': len(genesis_addresses),
@@ -1296,42 +1844,50 @@ def fund_from_genesis(address):
         if not DinariAddress.is_valid_address(address):
             return jsonify({'error': 'Invalid recipient address format'}), 400
         
-        data = request.get_json() if request.get_json() else {}
-        amount = Decimal(str(data.get('amount', '100')))  # Default 100 DINARI
+        data = request.get_json(silent=True) or {}
+        amount = _to_dec(data.get('amount', '100'))  # Default 100 DINARI
+        required = amount + DEFAULT_GAS_FEE
         
         # Find a genesis address with sufficient balance
         funded = False
-        for genesis_addr in DinariAddress.get_genesis_addresses():
+        get_balance = blockchain.get_dinari_balance
+        for genesis_addr in genesis_funding_order.candidates():
             try:
-                balance = blockchain.get_dinari_balance(genesis_addr)
-                if balance >= amount + Decimal('0.001'):  # Amount + gas fee
-                    # Create transaction from genesis to recipient
-                    tx = Transaction(
-                        from_address=genesis_addr,
-                        to_address=address,
-                        amount=amount,
-                        gas_price=Decimal('0.001'),
-                        gas_limit=21000,
-                        nonce=0,
-                        data=f"Genesis funding to {address}"
-                    )
-                    
-                    success = blockchain.add_transaction(tx)
-                    if success:
-                        funded = True
-                        return jsonify({
-                            'success': True,
-                            'transaction_hash': tx.get_hash(),
-                            'from_genesis': genesis_addr,
-                            'to_address': address,
-                            'amount': str(amount),
-                            'message': f'Funded {amount} DINARI from genesis'
-                        }), 200
-            except Exception as e:
-                logger.warning(f"Failed to fund from {genesis_addr}: {e}")
+                balance = get_balance(genesis_addr)
+            except (LookupError, ArithmeticError) as e:
+                logger.warning("Failed to read balance of %s: %s", genesis_addr, e)
                 continue
+            
+            if balance < required:  # Amount + gas fee
+                continue
+            
+            # Create transaction from genesis to recipient
+            tx = Transaction(
+                from_address=genesis_addr,
+                to_address=address,
+                amount=amount,
+                gas_price=DEFAULT_GAS_PRICE,
+                gas_limit=DEFAULT_GAS_LIMIT,
+                nonce=0,
+                data=f"Genesis funding to {address}"
+            )
+            
+            success = blockchain.add_transaction(tx)
+            if success:
+                chain_info_cache.invalidate()
+                genesis_funding_order.promote(genesis_addr)
+                funded = True
+                return jsonify({
+                    'success': True,
+                    'transaction_hash': tx.get_hash(),
+                    'from_genesis': genesis_addr,
+                    'to_address': address,
+                    'amount': str(amount),
+                    'message': f'Funded {amount} DINARI from genesis'
+                }), 200
         
         if not funded:
+            genesis_funding_order.mark_stale()
             return jsonify({
                 'success': False,
                 'error': 'No genesis address has sufficient balance'
@@ -1340,616 +1896,637 @@ def fund_from_genesis(address):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
-@app.route('/rpc', methods=['POST'])
-def rpc_handler():
-    """Complete JSON-RPC 2.0 endpoint for DinariBlockchain"""
+class RPCError(Exception):
+    """JSON-RPC error raised by a method handler with an explicit error code"""
+    
+    def __init__(self, message: str, code: int = -32603):
+        super().__init__(message)
+        self.code = code
+
+def rpc_dinari_ping(params):
+    """Liveness check"""
+    return "pong"
+
+def rpc_dinari_getBlockchainInfo(params):
+    """Get blockchain information"""
+    if not blockchain:
+        return {"error": "Blockchain not initialized"}
+    
+    chain_info = chain_info_cache.get()
+    
+    # Get AFC supply from Afrocoin contract
+    afc_supply = "0"
+    try:
+        afrocoin_contract = blockchain.get_afrocoin_contract()
+        if afrocoin_contract:
+            afc_supply = afrocoin_contract.state.variables.get('total_supply', '0')
+    except (AttributeError, LookupError):
+        afc_supply = "200000000"  # Default to 200M
+    
+    return {
+        "network_id": "dinari_mainnet",
+        "native_token": "DINARI", 
+        "stablecoin": "AFC",
+        "address_format": "DT-prefixed",
+        "genesis_compatibility": True,
+        "known_genesis_addresses": len(DinariAddress.GENESIS_ADDRESSES),
+        "height": chain_info.get('height', 0),
+        "total_transactions": chain_info.get('total_transactions', 0),
+        "pending_transactions": chain_info.get('pending_transactions', 0),
+        "validators": chain_info.get('validators', 0),
+        "contracts": chain_info.get('contracts', 0),
+        "total_dinari_supply": chain_info.get('total_dinari_supply', '0'),
+        "total_afc_supply": afc_supply,  # ADD AFC supply
+        "mining_active": chain_info.get('mining_active', False)
+    }
+
+def rpc_dinari_getBalance(params):
+    """Get DINARI and AFC balances for an address"""
+    if not params:
+        raise ValueError("Address parameter required")
+    address = params[0]
+    
+    # Validate DT address format (now supports genesis addresses)
+    if not DinariAddress.is_valid_address(address):
+        raise ValueError("Invalid DT address format")
+    
+    if not blockchain:
+        return {"DINARI": "0", "AFC": "0"}
+    
+    dinari_bal = str(blockchain.get_dinari_balance(address))
+    afc_bal = str(blockchain.get_afrocoin_balance(address))
+    return {
+        "address": address,
+        "is_genesis": DinariAddress.is_genesis_address(address),
+        "DINARI": dinari_bal, 
+        "AFC": afc_bal
+    }
+
+def rpc_dinari_createWallet(params):
+    """Create a wallet with a DT-prefixed address"""
+    wallet_name = params[0] if params else f"wallet_{int(time.time())}"
+    wallet = create_wallet()
+    
+    # Generate DT-prefixed address
+    dt_address = DinariAddress.generate_from_wallet_name(wallet_name)
+    
+    return {
+        "success": True,
+        "wallet_name": wallet_name,
+        "message": "Wallet created successfully",
+        "address": dt_address,
+        "address_format": "DT-prefixed",
+        "is_genesis": False
+    }
+
+def rpc_dinari_getRecentTransactions(params):
+    """Get recent transactions from permanent storage"""
+    result = handle_dinari_getRecentTransactions(params)
+    if not result["success"]:
+        raise RPCError(result["error"])
+    
+    return {
+        "transactions": result["transactions"],
+        "total": result["total"],
+        "has_more": result["has_more"]
+    }
+
+def rpc_dinari_generateAddress(params):
+    """Generate a new DT address"""
+    seed = params[0] if params else None
+    dt_address = DinariAddress.generate_address(seed)
+    
+    return {
+        "address": dt_address,
+        "address_format": "DT-prefixed",
+        "length": len(dt_address),
+        "is_genesis": False
+    }
+
+def rpc_dinari_validateAddress(params):
+    """Validate an address and describe its format"""
+    if not params:
+        raise ValueError("Address parameter required")
+    
+    return DinariAddress.get_address_info(params[0])
+
+def rpc_dinari_getGenesisAddresses(params):
+    """Get all genesis addresses with their balances"""
+    if not blockchain:
+        genesis_addresses = [dict(base_info) for base_info in _GENESIS_ADDRESS_INFO]
+    else:
+        try:
+            balances = blockchain.get_balances_bulk(_GENESIS_ADDRS)
+        except Exception:
+            balances = {}
+        genesis_addresses = []
+        for base_info in _GENESIS_ADDRESS_INFO:
+            dinari_balance, afc_balance = balances.get(base_info['address'], ("0", "0"))
+            genesis_addresses.append(dict(base_info, balances={
+                'DINARI': str(dinari_balance),
+                'AFC': str(afc_balance)
+            }))
+    
+    return {
+        "total_genesis_addresses": len(genesis_addresses),
+        "genesis_addresses": genesis_addresses
+    }
+
+def rpc_dinari_fundFromGenesis(params):
+    """Fund an address from genesis (for testing)"""
     try:
-        data = request.get_json()
+        recipient, amount, *_ = params
+    except (TypeError, ValueError):
+        raise ValueError("Required: recipient_address, amount")
+    
+    amount = _to_dec(amount)
+    
+    if not DinariAddress.is_valid_address(recipient):
+        raise ValueError("Invalid recipient address format")
+    
+    if not blockchain:
+        raise ValueError("Blockchain not available")
+    
+    required = amount + DEFAULT_GAS_FEE
+    
+    # Find genesis address with sufficient balance
+    get_balance = blockchain.get_dinari_balance
+    for genesis_addr in genesis_funding_order.candidates():
+        try:
+            balance = get_balance(genesis_addr)
+        except (LookupError, ArithmeticError):
+            # Missing or corrupt ledger entry - try the next genesis address
+            continue
         
-        if not data or 'method' not in data:
-            return jsonify({
-                "jsonrpc": "2.0",
-                "error": {"code": -32600, "message": "Invalid Request"},
-                "id": data.get('id') if data else None
-            }), 400
+        if balance < required:
+            continue
         
-        method = data['method']
-        params = data.get('params', [])
-        rpc_id = data.get('id', 1)
+        tx = Transaction(
+            from_address=genesis_addr,
+            to_address=recipient,
+            amount=amount,
+            gas_price=DEFAULT_GAS_PRICE,
+            gas_limit=DEFAULT_GAS_LIMIT,
+            nonce=0,
+            data="Genesis funding"
+        )
         
-        # Handle RPC methods
-        try:
-            if method == 'dinari_ping':
-                result = "pong"
-                
-            elif method == 'dinari_getBlockchainInfo':
-                if blockchain:
-                    chain_info = blockchain.get_chain_info()
-                    
-                    # Get AFC supply from Afrocoin contract
-                    afc_supply = "0"
-                    try:
-                        afrocoin_contract = blockchain.get_afrocoin_contract()
-                        if afrocoin_contract:
-                            afc_supply = afrocoin_contract.state.variables.get('total_supply', '0')
-                    except:
-                        afc_supply = "200000000"  # Default to 200M
-                    
-                    result = {
-                        "network_id": "dinari_mainnet",
-                        "native_token": "DINARI", 
-                        "stablecoin": "AFC",
-                        "address_format": "DT-prefixed",
-                        "genesis_compatibility": True,
-                        "known_genesis_addresses": len(DinariAddress.GENESIS_ADDRESSES),
-                        "height": chain_info.get('height', 0),
-                        "total_transactions": chain_info.get('total_transactions', 0),
-                        "pending_transactions": chain_info.get('pending_transactions', 0),
-                        "validators": chain_info.get('validators', 0),
-                        "contracts": chain_info.get('contracts', 0),
-                        "total_dinari_supply": chain_info.get('total_dinari_supply', '0'),
-                        "total_afc_supply": afc_supply,  # ADD AFC supply
-                        "mining_active": chain_info.get('mining_active', False)
-                    }
-                else:
-                    result = {"error": "Blockchain not initialized"}
-                    
-            elif method == 'dinari_getBalance':
-                if not params:
-                    raise ValueError("Address parameter required")
-                address = params[0]
-                
-                # Validate DT address format (now supports genesis addresses)
-                if not DinariAddress.is_valid_address(address):
-                    raise ValueError("Invalid DT address format")
-                
-                if blockchain:
-                    dinari_bal = str(blockchain.get_dinari_balance(address))
-                    afc_bal = str(blockchain.get_afrocoin_balance(address))
-                    result = {
-                        "address": address,
-                        "is_genesis": DinariAddress.is_genesis_address(address),
-                        "DINARI": dinari_bal, 
-                        "AFC": afc_bal
-                    }
-                else:
-                    result = {"DINARI": "0", "AFC": "0"}
-                    
-            elif method == 'dinari_createWallet':
-                wallet_name = params[0] if params else f"wallet_{int(time.time())}"
-                wallet = create_wallet()
-                
-                # Generate DT-prefixed address
-                dt_address = DinariAddress.generate_from_wallet_name(wallet_name)
-                
-                result = {
-                    "success": True,
-                    "wallet_name": wallet_name,
-                    "message": "Wallet created successfully",
-                    "address": dt_address,
-                    "address_format": "DT-prefixed",
-                    "is_genesis": False
-                }
+        # add_transaction reports failures by returning False
+        if blockchain.add_transaction(tx):
+            chain_info_cache.invalidate()
+            genesis_funding_order.promote(genesis_addr)
+            return {
+                "success": True,
+                "transaction_hash": tx.get_hash(),
+                "from_genesis": genesis_addr,
+                "to_address": recipient,
+                "amount": str(amount)
+            }
+    
+    genesis_funding_order.mark_stale()
+    return {"success": False, "error": "No genesis address has sufficient balance"}
 
-            elif method == "dinari_getRecentTransactions":
-                result = handle_dinari_getRecentTransactions(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": {
-                            "transactions": result["transactions"],
-                            "total": result["total"],
-                            "has_more": result["has_more"]
-                        },
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
-                
-            elif method == 'dinari_generateAddress':
-                # New method to generate DT address
-                seed = params[0] if params else None
-                dt_address = DinariAddress.generate_address(seed)
-                
-                result = {
-                    "address": dt_address,
-                    "address_format": "DT-prefixed",
-                    "length": len(dt_address),
-                    "is_genesis": False
-                }
-                
-            elif method == 'dinari_validateAddress':
-                if not params:
-                    raise ValueError("Address parameter required")
-                address = params[0]
-                
-                address_info = DinariAddress.get_address_info(address)
-                result = address_info
-                
-            elif method == 'dinari_getGenesisAddresses':
-                # New method to get all genesis addresses
-                genesis_addresses = []
-                for addr in DinariAddress.get_genesis_addresses():
-                    addr_info = DinariAddress.get_address_info(addr)
-                    if blockchain:
-                        try:
-                            dinari_balance = str(blockchain.get_dinari_balance(addr))
-                            afc_balance = str(blockchain.get_afrocoin_balance(addr))
-                            addr_info['balances'] = {
-                                'DINARI': dinari_balance,
-                                'AFC': afc_balance
-                            }
-                        except:
-                            addr_info['balances'] = {'DINARI': '0', 'AFC': '0'}
-                    genesis_addresses.append(addr_info)
-                
-                result = {
-                    "total_genesis_addresses": len(genesis_addresses),
-                    "genesis_addresses": genesis_addresses
-                }
-                
-            elif method == 'dinari_fundFromGenesis':
-                # New method to fund from genesis (for testing)
-                if len(params) < 2:
-                    raise ValueError("Required: recipient_address, amount")
-                
-                recipient = params[0]
-                amount = Decimal(str(params[1]))
-                
-                if not DinariAddress.is_valid_address(recipient):
-                    raise ValueError("Invalid recipient address format")
-                
-                # Find genesis address with sufficient balance
-                for genesis_addr in DinariAddress.get_genesis_addresses():
-                    try:
-                        balance = blockchain.get_dinari_balance(genesis_addr)
-                        if balance >= amount + Decimal('0.001'):
-                            tx = Transaction(
-                                from_address=genesis_addr,
-                                to_address=recipient,
-                                amount=amount,
-                                gas_price=Decimal('0.001'),
-                                gas_limit=21000,
-                                nonce=0,
-                                data="Genesis funding"
-                            )
-                            
-                            success = blockchain.add_transaction(tx)
-                            if success:
-                                result = {
-                                    "success": True,
-                                    "transaction_hash": tx.get_hash(),
-                                    "from_genesis": genesis_addr,
-                                    "to_address": recipient,
-                                    "amount": str(amount)
-                                }
-                                break
-                    except:
-                        continue
-                else:
-                    result = {"success": False, "error": "No genesis address has sufficient balance"}
-                
-            elif method == 'dinari_sendTransaction':
-                if len(params) < 3:
-                    raise ValueError("Required: from_address, to_address, amount")
-                
-                from_addr = params[0]
-                to_addr = params[1] 
-                amount = params[2]
-                gas_price = params[3] if len(params) > 3 else "0.001"
-                data_field = params[4] if len(params) > 4 else ""
-                
-                # Validate DT addresses (now supports genesis addresses)
-                if not DinariAddress.is_valid_address(from_addr):
-                    raise ValueError("Invalid from_address format")
-                if not DinariAddress.is_valid_address(to_addr):
-                    raise ValueError("Invalid to_address format")
-                
-                if blockchain:
-                    tx = Transaction(
-                        from_address=from_addr,
-                        to_address=to_addr,
-                        amount=Decimal(str(amount)),
-                        gas_price=Decimal(str(gas_price)),
-                        gas_limit=21000,
-                        nonce=0,
-                        data=data_field
-                    )
-                    
-                    success = blockchain.add_transaction(tx)
-                    if success:
-                        result = {
-                            "success": True,
-                            "transaction_hash": tx.get_hash(),
-                            "from": from_addr,
-                            "to": to_addr,
-                            "amount": amount,
-                            "gas_price": gas_price,
-                            "from_genesis": DinariAddress.is_genesis_address(from_addr),
-                            "to_genesis": DinariAddress.is_genesis_address(to_addr)
-                        }
-                    else:
-                        result = {"success": False, "error": "Transaction failed"}
-                else:
-                    result = {"success": False, "error": "Blockchain not available"}
-                    
-            elif method == 'dinari_callContract':
-                if len(params) < 3:
-                    raise ValueError("Required: contract_id, function_name, caller")
-                    
-                contract_id = params[0]
-                function_name = params[1]
-                caller = params[2]
-                args = params[3] if len(params) > 3 else {}
-                
-                # Validate caller address (now supports genesis addresses)
-                if not DinariAddress.is_valid_address(caller):
-                    raise ValueError("Invalid caller address format")
-                
-                if contract_manager:
-                    function_data = {
-                        'function': function_name,
-                        'args': args
-                    }
-                    
-                    contract_result = contract_manager.execute_contract(
-                        contract_id=contract_id,
-                        function_data=function_data,
-                        caller=caller,
-                        value=Decimal('0')
-                    )
-                    
-                    result = {
-                        "success": contract_result.get('success', False),
-                        "result": contract_result.get('result', ''),
-                        "gas_used": contract_result.get('gas_used', 0),
-                        "error": contract_result.get('error', None),
-                        "caller_is_genesis": DinariAddress.is_genesis_address(caller)
-                    }
-                else:
-                    result = {"success": False, "error": "Contract manager not available"}
-                    
-            elif method == 'dinari_getNetworkInfo':
-                if blockchain_node and hasattr(blockchain_node, 'get_network_info'):
-                    network_info = blockchain_node.get_network_info()
-                    result = {
-                        "node_id": NODE_ID,
-                        "connected_peers": network_info.get('connected_peers', 0),
-                        "is_validator": network_info.get('is_validator', False),
-                        "p2p_port": P2P_PORT,
-                        "api_port": PORT,
-                        "address_format": "DT-prefixed",
-                        "genesis_compatibility": True,
-                        "p2p_status": "active"
-                    }
-                else:
-                    result = {
-                        "node_id": NODE_ID,
-                        "connected_peers": 0,
-                        "is_validator": False,
-                        "p2p_port": P2P_PORT,
-                        "api_port": PORT,
-                        "address_format": "DT-prefixed",
-                        "genesis_compatibility": True,
-                        "p2p_status": "disabled"
-                    }
-                    
-            elif method == 'dinari_getValidators':
-                if blockchain:
-                    result = blockchain.validators if hasattr(blockchain, 'validators') else []
-                else:
-                    result = []
-            
-            elif method == "dinari_getDualTokenStatus":
-                result = handle_dinari_getDualTokenStatus(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0", 
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
-            
-            # ========== PRIORITY 1 RPC METHODS ==========
-            elif method == "dinari_getTransactionHistory":
-                result = handle_dinari_getTransactionHistory(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_sendTransaction(params):
+    """Submit a DINARI transfer"""
+    try:
+        from_addr, to_addr, amount, *extra = params
+    except (TypeError, ValueError):
+        raise ValueError("Required: from_address, to_address, amount")
+    
+    gas_price = extra[0] if extra else DEFAULT_GAS_PRICE
+    data_field = extra[1] if len(extra) > 1 else ""
+    
+    # Validate DT addresses (now supports genesis addresses); the genesis
+    # flags for the response come from the same lookup
+    from_valid, from_genesis = DinariAddress.classify_address(from_addr)
+    if not from_valid:
+        raise ValueError("Invalid from_address format")
+    to_valid, to_genesis = DinariAddress.classify_address(to_addr)
+    if not to_valid:
+        raise ValueError("Invalid to_address format")
+    
+    if not blockchain:
+        return {"success": False, "error": "Blockchain not available"}
+    
+    tx = Transaction(
+        from_address=from_addr,
+        to_address=to_addr,
+        amount=_to_dec(amount),
+        gas_price=_to_dec(gas_price),
+        gas_limit=DEFAULT_GAS_LIMIT,
+        nonce=0,
+        data=data_field
+    )
+    
+    success = blockchain.add_transaction(tx)
+    if not success:
+        return {"success": False, "error": "Transaction failed"}
+    
+    chain_info_cache.invalidate()
+    return {
+        "success": True,
+        "transaction_hash": tx.get_hash(),
+        "from": from_addr,
+        "to": to_addr,
+        "amount": amount,
+        "gas_price": gas_price,
+        "from_genesis": from_genesis,
+        "to_genesis": to_genesis
+    }
 
-            elif method == "dinari_getTransactionDetails":
-                result = handle_dinari_getTransactionDetails(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_callContract(params):
+    """Call a smart contract function"""
+    try:
+        contract_id, function_name, caller, *extra = params
+    except (TypeError, ValueError):
+        raise ValueError("Required: contract_id, function_name, caller")
+    
+    args = extra[0] if extra else {}
+    
+    # Validate caller address (now supports genesis addresses)
+    if not DinariAddress.is_valid_address(caller):
+        raise ValueError("Invalid caller address format")
+    
+    if not contract_manager:
+        return {"success": False, "error": "Contract manager not available"}
+    
+    function_data = {
+        'function': function_name,
+        'args': args
+    }
+    
+    contract_result = contract_manager.execute_contract(
+        contract_id=contract_id,
+        function_data=function_data,
+        caller=caller,
+        value=_ZERO
+    )
+    contract_info_cache.pop(contract_id)
+    
+    return {
+        "success": contract_result.get('success', False),
+        "result": contract_result.get('result', ''),
+        "gas_used": contract_result.get('gas_used', 0),
+        "error": contract_result.get('error', None),
+        "caller_is_genesis": DinariAddress.is_genesis_address(caller)
+    }
 
-            elif method == "dinari_estimateGas":
-                result = handle_dinari_estimateGas(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_getNetworkInfo(params):
+    """Get P2P network information for this node"""
+    if blockchain_node and node_network_info is not None:
+        network_info = node_network_info()
+        return {
+            "node_id": NODE_ID,
+            "connected_peers": network_info.get('connected_peers', 0),
+            "is_validator": network_info.get('is_validator', False),
+            "p2p_port": P2P_PORT,
+            "api_port": PORT,
+            "address_format": "DT-prefixed",
+            "genesis_compatibility": True,
+            "p2p_status": "active"
+        }
+    
+    return {
+        "node_id": NODE_ID,
+        "connected_peers": 0,
+        "is_validator": False,
+        "p2p_port": P2P_PORT,
+        "api_port": PORT,
+        "address_format": "DT-prefixed",
+        "genesis_compatibility": True,
+        "p2p_status": "disabled"
+    }
 
-            elif method == "dinari_getCurrentGasPrices":
-                result = handle_dinari_getCurrentGasPrices(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_getValidators(params):
+    """Get the active validator set"""
+    if blockchain:
+        return getattr(blockchain, 'validators', [])
+    return []
+
+# API-triggered block creation runs on one worker so blocks are built one
+# at a time; async jobs are remembered (bounded) for dinari_getMineStatus
+_MINER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dinari-miner')
+_MINE_JOBS = OrderedDict()  # job_id -> Future
+_MINE_JOBS_LOCK = threading.Lock()
+MAX_MINE_JOBS = 256
+
+def _mine_block(validator):
+    """Create a block and describe the outcome (runs on _MINER_POOL)"""
+    block = blockchain.create_block(validator)
+    if not block:
+        return {"success": False, "error": "No pending transactions"}
+    
+    chain_info_cache.invalidate()
+    return {
+        "success": True,
+        "block_index": block.index,
+        "block_hash": block.get_hash(),
+        "validator": validator,
+        "transactions": len(block.transactions),
+        "timestamp": block.timestamp
+    }
 
-            elif method == "dinari_estimateTransactionFee":
-                result = handle_dinari_estimateTransactionFee(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_mineBlock(params):
+    """
+    Mine a block with the pending transactions
+    
+    Params: [validator, wait=True]. With wait=false the block is created in
+    the background and a job_id is returned for dinari_getMineStatus.
+    """
+    validator = params[0] if params else "default_validator"
+    wait = bool(params[1]) if params and len(params) > 1 else True
+    if not blockchain:
+        return {"success": False, "error": "Blockchain not available"}
+    
+    if wait:
+        return _MINER_POOL.submit(_mine_block, validator).result()
+    
+    job_id = secrets.token_hex(8)
+    with _MINE_JOBS_LOCK:
+        # Forget the oldest finished jobs to make room; the single worker
+        # runs jobs in order, so a pending oldest job means all are pending
+        while len(_MINE_JOBS) >= MAX_MINE_JOBS:
+            oldest = next(iter(_MINE_JOBS))
+            if not _MINE_JOBS[oldest].done():
+                raise RPCError("Too many pending mining jobs", -32000)
+            del _MINE_JOBS[oldest]
+        _MINE_JOBS[job_id] = _MINER_POOL.submit(_mine_block, validator)
+    
+    return {"job_id": job_id, "status": "pending", "validator": validator}
 
-            # ========== NEW BLOCKCHAIN EXPLORER METHODS ==========
-            elif method == "dinari_getBlock":
-                result = handle_dinari_getBlock(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_getMineStatus(params):
+    """Poll a background block creation started by dinari_mineBlock"""
+    if not params:
+        raise RPCError("Job ID parameter required", -32602)
+    
+    job_id = params[0]
+    with _MINE_JOBS_LOCK:
+        future = _MINE_JOBS.get(job_id) if isinstance(job_id, str) else None
+    if future is None:
+        # Unknown or already forgotten id - a client error, not a server fault
+        raise RPCError("Unknown mining job", -32602)
+    
+    if not future.done():
+        return {"job_id": job_id, "status": "pending"}
+    
+    try:
+        result = future.result()
+    except Exception as e:
+        return {"job_id": job_id, "status": "failed", "success": False, "error": str(e)}
+    
+    return dict(result, job_id=job_id, status="done")
+
+# Constant for the life of the process - shared by every call, never mutated
+_VERSION_RESULT = {
+    "blockchain_version": "1.0.0",
+    "api_version": "1.0.0", 
+    "rpc_version": "2.0",
+    "network": "dinari_mainnet",
+    "native_token": "DINARI",
+    "stablecoin": "AFC",
+    "address_format": "DT-prefixed addresses",
+    "address_length": _DT_LEN,
+    "genesis_compatibility": True
+}
+
+def rpc_dinari_getVersion(params):
+    """Get blockchain, API and RPC versions"""
+    return _VERSION_RESULT
+
+def rpc_dinari_getAfcSupply(params):
+    """Get AFC supply specifically"""
+    afc_supply = "0"
+    try:
+        if blockchain:
+            afrocoin_contract = blockchain.get_afrocoin_contract()
+            if afrocoin_contract:
+                afc_supply = afrocoin_contract.state.variables.get('total_supply', '0')
+            else:
+                afc_supply = "200000000"  # Default
+        return {
+            "total_afc_supply": afc_supply,
+            "symbol": "AFC",
+            "name": "Afrocoin",
+            "contract_id": "afrocoin_stablecoin",
+            "backed_by": "DINARI"
+        }
+    except Exception as e:
+        return {"error": str(e)}
 
-            elif method == "dinari_getTransaction":
-                result = handle_dinari_getTransaction(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_getContractInfo(params):
+    """Get smart contract metadata"""
+    if not params:
+        raise ValueError("Contract ID required")
+    contract_id = params[0]
+    
+    if not contract_manager:
+        return {"error": "Contract manager not available"}
+    
+    info = contract_info_cache.get(contract_id)
+    if info is not None:
+        return info
+    
+    contract = contract_manager.get_contract(contract_id)
+    if not contract:
+        return {"error": f"Contract {contract_id} not found"}
+    
+    info = {
+        "contract_id": contract.contract_id,
+        "owner": contract.owner,
+        "owner_is_genesis": DinariAddress.is_genesis_address(contract.owner),
+        "contract_type": contract.contract_type,
+        "created_at": contract.created_at,
+        "is_active": contract.state.is_active,
+        "balance": str(contract.state.balance)
+    }
+    contract_info_cache.set(contract_id, info)
+    return info
 
-            elif method == "dinari_getRecentBlocks":
-                result = handle_dinari_getRecentBlocks(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+# Contract IDs: process start time plus a per-process sequence, so two
+# deploys in the same second no longer collide
+_DEPLOY_EPOCH = int(time.time())
+_DEPLOY_SEQ = itertools.count(1)
 
-            elif method == "dinari_getRecentTransactions":
-                result = handle_dinari_getRecentTransactions(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
+def rpc_dinari_deployContract(params):
+    """Deploy a general smart contract"""
+    try:
+        contract_code, deployer, *extra = params
+    except (TypeError, ValueError):
+        raise ValueError("Required: contract_code, deployer")
+    
+    init_args = extra[0] if extra else {}
+    
+    # Validate deployer address (now supports genesis addresses)
+    if not DinariAddress.is_valid_address(deployer):
+        raise ValueError("Invalid deployer address format")
+    
+    contract_id = f"contract_{_DEPLOY_EPOCH}_{next(_DEPLOY_SEQ)}"
+    
+    if not contract_manager:
+        return {"success": False, "error": "Contract manager not available"}
+    
+    contract = contract_manager.deploy_contract(
+        contract_id=contract_id,
+        code=contract_code,
+        owner=deployer,
+        contract_type="general",
+        initial_state=init_args
+    )
+    contract_info_cache.pop(contract_id)
+    
+    return {
+        "success": True,
+        "contract_id": contract_id,
+        "deployer": deployer,
+        "deployer_is_genesis": DinariAddress.is_genesis_address(deployer),
+        "contract_address": contract_id
+    }
 
-            elif method == "dinari_getBlockTransactions":
-                result = handle_dinari_getBlockTransactions(params)
-                if result["success"]:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "result": result["data"],
-                        "id": data.get("id", 1)
-                    })
-                else:
-                    return jsonify({
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32603, "message": result["error"]},
-                        "id": data.get("id", 1)
-                    })
-            # ========== END BLOCKCHAIN EXPLORER METHODS ==========
-                    
-            elif method == 'dinari_mineBlock':
-                validator = params[0] if params else "default_validator"
-                if blockchain:
-                    block = blockchain.create_block(validator)
-                    if block:
-                        result = {
-                            "success": True,
-                            "block_index": block.index,
-                            "block_hash": block.get_hash(),
-                            "validator": validator,
-                            "transactions": len(block.transactions),
-                            "timestamp": block.timestamp
-                        }
-                    else:
-                        result = {"success": False, "error": "No pending transactions"}
-                else:
-                    result = {"success": False, "error": "Blockchain not available"}
-                    
-            elif method == 'dinari_getVersion':
-                result = {
-                    "blockchain_version": "1.0.0",
-                    "api_version": "1.0.0", 
-                    "rpc_version": "2.0",
-                    "network": "dinari_mainnet",
-                    "native_token": "DINARI",
-                    "stablecoin": "AFC",
-                    "address_format": "DT-prefixed addresses",
-                    "address_length": 42,
-                    "genesis_compatibility": True
-                }
-            
-            elif method == 'dinari_getAfcSupply':
-            # New method to get AFC supply specifically
-                afc_supply = "0"
-                try:
-                    if blockchain:
-                        afrocoin_contract = blockchain.get_afrocoin_contract()
-                        if afrocoin_contract:
-                            afc_supply = afrocoin_contract.state.variables.get('total_supply', '0')
-                        else:
-                            afc_supply = "200000000"  # Default
-                    result = {
-                        "total_afc_supply": afc_supply,
-                        "symbol": "AFC",
-                        "name": "Afrocoin",
-                        "contract_id": "afrocoin_stablecoin",
-                        "backed_by": "DINARI"
-                    }
-                except Exception as e:
-                    result = {"error": str(e)}
-                
-            elif method == 'dinari_getContractInfo':
-                if not params:
-                    raise ValueError("Contract ID required")
-                contract_id = params[0]
-                
-                if contract_manager:
-                    contract = contract_manager.get_contract(contract_id)
-                    if contract:
-                        result = {
-                            "contract_id": contract.contract_id,
-                            "owner": contract.owner,
-                            "owner_is_genesis": DinariAddress.is_genesis_address(contract.owner),
-                            "contract_type": contract.contract_type,
-                            "created_at": contract.created_at,
-                            "is_active": contract.state.is_active,
-                            "balance": str(contract.state.balance)
-                        }
-                    else:
-                        result = {"error": f"Contract {contract_id} not found"}
-                else:
-                    result = {"error": "Contract manager not available"}
-                    
-            elif method == 'dinari_deployContract':
-                if len(params) < 2:
-                    raise ValueError("Required: contract_code, deployer")
-                    
-                contract_code = params[0]
-                deployer = params[1]
-                init_args = params[2] if len(params) > 2 else {}
-                
-                # Validate deployer address (now supports genesis addresses)
-                if not DinariAddress.is_valid_address(deployer):
-                    raise ValueError("Invalid deployer address format")
-                
-                contract_id = f"contract_{int(time.time())}"
-                
-                if contract_manager:
-                    contract = contract_manager.deploy_contract(
-                        contract_id=contract_id,
-                        code=contract_code,
-                        owner=deployer,
-                        contract_type="general",
-                        initial_state=init_args
-                    )
-                    
-                    result = {
-                        "success": True,
-                        "contract_id": contract_id,
-                        "deployer": deployer,
-                        "deployer_is_genesis": DinariAddress.is_genesis_address(deployer),
-                        "contract_address": contract_id
-                    }
-                else:
-                    result = {"success": False, "error": "Contract manager not available"}
-                    
-            else:
-                return jsonify({
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32601, "message": "Method not found"},
-                    "id": rpc_id
-                }), 404
-            
-            return jsonify({
-                "jsonrpc": "2.0",
-                "result": result,
-                "id": rpc_id
-            })
-            
-        except Exception as method_error:
-            return jsonify({
-                "jsonrpc": "2.0",
-                "error": {"code": -32000, "message": str(method_error)},
-                "id": rpc_id
-            }), 500
+def _rpc_from_handler(handler):
+    """Adapt a handle_dinari_* function returning {success, data|error} to the RPC table"""
+    def rpc_method(params):
+        result = handler(params)
+        if not result["success"]:
+            raise RPCError(result["error"])
+        return result["data"]
+    rpc_method.__name__ = handler.__name__
+    rpc_method.__doc__ = handler.__doc__
+    return rpc_method
+
+# JSON-RPC method name -> callable(params) returning the call's result
+_RPC_METHODS = {
+    'dinari_ping': rpc_dinari_ping,
+    'dinari_getBlockchainInfo': rpc_dinari_getBlockchainInfo,
+    'dinari_getBalance': rpc_dinari_getBalance,
+    'dinari_createWallet': rpc_dinari_createWallet,
+    'dinari_getRecentTransactions': rpc_dinari_getRecentTransactions,
+    'dinari_generateAddress': rpc_dinari_generateAddress,
+    'dinari_validateAddress': rpc_dinari_validateAddress,
+    'dinari_getGenesisAddresses': rpc_dinari_getGenesisAddresses,
+    'dinari_fundFromGenesis': rpc_dinari_fundFromGenesis,
+    'dinari_sendTransaction': rpc_dinari_sendTransaction,
+    'dinari_callContract': rpc_dinari_callContract,
+    'dinari_getNetworkInfo': rpc_dinari_getNetworkInfo,
+    'dinari_getValidators': rpc_dinari_getValidators,
+    'dinari_getDualTokenStatus': _rpc_from_handler(handle_dinari_getDualTokenStatus),
+    # ========== PRIORITY 1 RPC METHODS ==========
+    'dinari_getTransactionHistory': _rpc_from_handler(handle_dinari_getTransactionHistory),
+    'dinari_getTransactionDetails': _rpc_from_handler(handle_dinari_getTransactionDetails),
+    'dinari_estimateGas': _rpc_from_handler(handle_dinari_estimateGas),
+    'dinari_getCurrentGasPrices': _rpc_from_handler(handle_dinari_getCurrentGasPrices),
+    'dinari_estimateTransactionFee': _rpc_from_handler(handle_dinari_estimateTransactionFee),
+    # ========== BLOCKCHAIN EXPLORER METHODS ==========
+    'dinari_getBlock': _rpc_from_handler(handle_dinari_getBlock),
+    'dinari_getTransaction': _rpc_from_handler(handle_dinari_getTransaction),
+    'dinari_getRecentBlocks': _rpc_from_handler(handle_dinari_getRecentBlocks),
+    'dinari_getBlockTransactions': _rpc_from_handler(handle_dinari_getBlockTransactions),
+    # ========== END BLOCKCHAIN EXPLORER METHODS ==========
+    'dinari_mineBlock': rpc_dinari_mineBlock,
+    'dinari_getMineStatus': rpc_dinari_getMineStatus,
+    'dinari_getVersion': rpc_dinari_getVersion,
+    'dinari_getAfcSupply': rpc_dinari_getAfcSupply,
+    'dinari_getContractInfo': rpc_dinari_getContractInfo,
+    'dinari_deployContract': rpc_dinari_deployContract,
+}
+
+# Fixed JSON-RPC error objects - shared read-only, only the envelope id varies
+_ERR_INVALID_REQUEST = {"code": -32600, "message": "Invalid Request"}
+_ERR_METHOD_NOT_FOUND = {"code": -32601, "message": "Method not found"}
+_ERR_BATCH_TOO_LARGE = {"code": -32600, "message": f"Batch too large (max {MAX_RPC_BATCH_SIZE} calls)"}
+
+# Pre-encoded "method not found" reply for single calls; only the id is
+# serialized per request, so probing random method names stays cheap
+_METHOD_NOT_FOUND_BODY = (
+    b'{"jsonrpc":"2.0","error":{"code":-32601,"message":"Method not found"},"id":%s}'
+)
+
+def _rpc_error(error: dict, rpc_id=None) -> dict:
+    """Wrap a JSON-RPC error object in a response envelope"""
+    return {"jsonrpc": "2.0", "error": error, "id": rpc_id}
+
+def _handle_rpc_call(data):
+    """Dispatch a single JSON-RPC 2.0 call and return (response, status)"""
+    if not isinstance(data, dict) or 'method' not in data:
+        return _rpc_error(_ERR_INVALID_REQUEST, data.get('id') if isinstance(data, dict) else None), 400
+    
+    params = data.get('params', [])
+    rpc_id = data.get('id', 1)
+    
+    handler = _RPC_METHODS.get(data['method'])
+    if handler is None:
+        return _rpc_error(_ERR_METHOD_NOT_FOUND, rpc_id), 404
+    
+    try:
+        result = handler(params)
+        
+    except RPCError as rpc_error:
+        return _rpc_error({"code": rpc_error.code, "message": str(rpc_error)}, rpc_id), 200
+        
+    except Exception as method_error:
+        return _rpc_error({"code": -32000, "message": str(method_error)}, rpc_id), 500
+    
+    return {
+        "jsonrpc": "2.0",
+        "result": result,
+        "id": rpc_id
+    }, 200
+
+def _handle_rpc_batch(calls):
+    """
+    Dispatch a JSON-RPC 2.0 batch and return (responses, status)
+    
+    responses is None when every call was a notification (nothing to send).
+    """
+    if not calls:
+        return _rpc_error(_ERR_INVALID_REQUEST), 400
+    
+    if len(calls) > MAX_RPC_BATCH_SIZE:
+        return _rpc_error(_ERR_BATCH_TOO_LARGE), 400
+    
+    responses = []
+    for call in calls:
+        response, _ = _handle_rpc_call(call)
+        # Notifications (calls without an id) get no response entry
+        if isinstance(call, dict) and 'id' not in call:
+            continue
+        responses.append(response)
+    
+    if not responses:
+        return None, 204
+    return responses, 200
+
+@app.route('/rpc', methods=['POST'])
+def rpc_handler():
+    """Complete JSON-RPC 2.0 endpoint for DinariBlockchain"""
+    data = None
+    try:
+        # A missing or unparsable body falls through to the -32600 branch
+        # of _handle_rpc_call instead of raising BadRequest
+        data = request.get_json(silent=True)
+        
+        if isinstance(data, list):
+            response, status = _handle_rpc_batch(data)
+            if response is None:
+                return '', status
+            return jsonify(response), status
+        
+        response, status = _handle_rpc_call(data)
+        if response.get("error") is _ERR_METHOD_NOT_FOUND:
+            rpc_id = app.json.dumps(response["id"]).encode('utf-8')
+            return Response(_METHOD_NOT_FOUND_BODY % rpc_id, status, mimetype=app.json.mimetype)
+        return jsonify(response), status
         
     except Exception as e:
-        return jsonify({
-            "jsonrpc": "2.0",
-            "error": {"code": -32000, "message": str(e)},
-            "id": data.get('id') if 'data' in locals() else None
-        }), 500
+        return jsonify(_rpc_error(
+            {"code": -32000, "message": str(e)},
+            data.get('id') if isinstance(data, dict) else None
+        )), 500
 
 @app.route('/api/wallet/create', methods=['POST'])
 def create_new_wallet():
     """Create a new wallet"""
     try:
-        data = request.get_json() if request.get_json() else {}
+        data = request.get_json(silent=True) or {}
         wallet_name = data.get('name', f'wallet_{int(time.time())}')
         
         wallet = create_wallet()
@@ -1973,7 +2550,7 @@ def create_new_wallet():
 def generate_address():
     """Generate a new DT-prefixed address"""
     try:
-        data = request.get_json() if request.get_json() else {}
+        data = request.get_json(silent=True) or {}
         seed = data.get('seed', None)
         address_type = data.get('type', 'standard')  # standard, multisig
         
@@ -2035,7 +2612,7 @@ def get_address_info(address):
                     'DINARI': dinari_balance,
                     'AFC': afc_balance
                 }
-            except:
+            except (LookupError, ArithmeticError):
                 address_info['balances'] = {'DINARI': '0', 'AFC': '0'}
         
         return jsonify(address_info), 200
@@ -2054,8 +2631,8 @@ def get_peers():
                 'message': 'P2P networking not available'
             }), 200
         
-        if hasattr(blockchain_node, 'get_network_info'):
-            network_info = blockchain_node.get_network_info()
+        if node_network_info is not None:
+            network_info = node_network_info()
             return jsonify({
                 'connected_peers': network_info.get('connected_peers', 0),
                 'peers_info': network_info.get('peers_info', [])
@@ -2070,6 +2647,18 @@ def get_peers():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Static part of /api/stats - built once, shared read-only by every request
+_ADDRESS_SYSTEM_STATS = {
+    'format': 'DT-prefixed',
+    'prefix': _DT_PREFIX,
+    'length': _DT_LEN,
+    'hash_length': _HASH_LEN,
+    'genesis_compatibility': True,
+    'known_genesis_addresses': len(DinariAddress.GENESIS_ADDRESSES)
+}
+
+_STATS_MAX_AGE = int(os.getenv('STATS_MAX_AGE', 1))
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get comprehensive blockchain statistics"""
@@ -2077,28 +2666,19 @@ def get_stats():
         stats = {
             'timestamp': time.time(),
             'node_id': NODE_ID,
-            'address_system': {
-                'format': 'DT-prefixed',
-                'prefix': 'DT',
-                'length': 42,
-                'hash_length': 40,
-                'genesis_compatibility': True,
-                'known_genesis_addresses': len(DinariAddress.GENESIS_ADDRESSES)
-            }
+            'address_system': _ADDRESS_SYSTEM_STATS
         }
         
         if blockchain:
             try:
-                chain_info = blockchain.get_chain_info()
-                stats['blockchain'] = chain_info
+                stats['blockchain'] = chain_info_cache.get()
             except Exception as e:
                 stats['blockchain'] = {'error': str(e)}
         
         if blockchain_node:
             try:
-                if hasattr(blockchain_node, 'get_network_info'):
-                    network_info = blockchain_node.get_network_info()
-                    stats['network'] = network_info
+                if node_network_info is not None:
+                    stats['network'] = node_network_info()
                 else:
                     stats['network'] = {'message': 'Network info not available'}
             except Exception as e:
@@ -2106,16 +2686,18 @@ def get_stats():
         else:
             stats['network'] = {'message': 'P2P networking not initialized'}
         
-        return jsonify(stats), 200
+        response = jsonify(stats)
+        # Dashboards poll this; let browsers and proxies reuse a snapshot briefly
+        response.cache_control.public = True
+        response.cache_control.max_age = _STATS_MAX_AGE
+        return response, 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Updated web interface with current DinariBlockchain information
-@app.route('/', methods=['GET'])
-def index():
-    """Updated web interface with latest blockchain data"""
-    return '''
+# The landing page is static (live data is fetched client-side), so encode it once
+_INDEX_HTML = '''
     <!DOCTYPE html>
     <html>
     <head>
@@ -2487,7 +3069,19 @@ Genesis Address: ${data.is_genesis ? 'Yes' : 'No'}`);
         </script>
     </body>
     </html>
-    '''
+    '''.encode('utf-8')
+_INDEX_ETAG = hashlib.sha256(_INDEX_HTML).hexdigest()[:32]
+_INDEX_MAX_AGE = int(os.getenv('INDEX_MAX_AGE', 300))
+
+@app.route('/', methods=['GET'])
+def index():
+    """Updated web interface with latest blockchain data"""
+    response = Response(_INDEX_HTML, mimetype='text/html')
+    response.set_etag(_INDEX_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = _INDEX_MAX_AGE
+    # Answers a matching If-None-Match with an empty 304
+    return response.make_conditional(request)
 
 # Error handlers
 @app.errorhandler(404)
@@ -2502,20 +3096,19 @@ if __name__ == '__main__':
     try:
         # Initialize blockchain
         initialize_blockchain()
+        _initialized = True
         
         # Start Flask app
-        logger.info(f"🚀 Starting DinariBlockchain API server on port {PORT}")
-        logger.info(f"📍 Using DT-prefixed address format with genesis compatibility")
-        logger.info(f"🔑 Supporting {len(DinariAddress.GENESIS_ADDRESSES)} known genesis addresses")
+        logger.info("Starting DinariBlockchain API server on port %s", PORT)
+        logger.info("Using DT-prefixed address format with genesis compatibility")
+        logger.info("Supporting %d known genesis addresses", len(DinariAddress.GENESIS_ADDRESSES))
 
         app.run(host='0.0.0.0', port=PORT, debug=False, use_reloader=False)
         
     except Exception as e:
-        logger.error(f"❌ Failed to start API server: {e}")
+        logger.error("Failed to start API server: %s", e)
         raise
-else:
-    # For production deployment (gunicorn)
-    try:
-        initialize_blockchain()
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize for production: {e}")
\ No newline at end of file
+
+# For production deployment: gunicorn app:app (settings in gunicorn.conf.py).
+# Importing the module does not start the blockchain; the worker's
+# post_worker_init hook calls ensure_blockchain_initialized()
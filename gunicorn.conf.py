@@ -0,0 +1,35 @@
+"""
+DinariBlockchain - Gunicorn configuration
+gunicorn.conf.py - Production WSGI settings for the API server (gunicorn app:app)
+"""
+
+import os
+
+# Bind to the same port app.py uses for the dev server
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Blockchain state (balances, pending pool, mining threads, P2P listener)
+# lives in the worker process, so keep a single worker and scale with threads
+workers = 1
+
+# Load the code once in the master; importing app.py does not start the
+# blockchain, so nothing thread- or socket-bound is forked
+preload_app = True
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Block creation and contract calls can hold a request for a while
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Log to stdout/stderr like the dev server
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def post_worker_init(worker):
+    """Start the blockchain in the worker before it accepts requests"""
+    from app import ensure_blockchain_initialized
+    ensure_blockchain_initialized()
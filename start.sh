@@ -2,4 +2,4 @@
 export NODE_ENV=production
 export DINARI_DEBUG=false
 export LEVELDB_CACHE_SIZE_MB=32
-python app.py
\ No newline at end of file
+exec gunicorn app:app
\ No newline at end of file
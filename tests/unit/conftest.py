@@ -0,0 +1,24 @@
+"""
+DinariBlockchain - shared unit test fixtures
+tests/unit/conftest.py
+"""
+
+import os
+import tempfile
+
+# Importing the Dinari package builds a throwaway chain in ./dinari_data;
+# run from a scratch directory so the checkout's data files stay untouched
+os.chdir(tempfile.mkdtemp(prefix="dinari-tests-"))
+
+import pytest
+
+from Dinari.blockchain import DinariBlockchain
+
+
+@pytest.fixture
+def chain(tmp_path):
+    """A fresh genesis chain in a temporary data directory, mining stopped"""
+    blockchain = DinariBlockchain(str(tmp_path / "dinari_data"))
+    blockchain.stop_automatic_mining()
+    yield blockchain
+    blockchain.stop_automatic_mining()
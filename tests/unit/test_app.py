@@ -0,0 +1,175 @@
+"""
+DinariBlockchain - API server unit tests
+tests/unit/test_app.py
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pytest
+
+import app as api_server
+from app import DinariAddress
+
+# Addresses issued by the original SHA-256 derivation - must never change
+ALICE_ADDRESS = "DT2bd806c97f0e00af1a1fc3328fa763a9269723c8"
+MULTISIG_ADDRESS = "DT6a374cef08a1e1e04094bfec1e5d7adf3e1b191d"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Flask test client that does not start a chain on the first request"""
+    monkeypatch.setattr(api_server, "_initialized", True)
+    return api_server.app.test_client()
+
+
+def rpc(client, method, params=None):
+    body = {"jsonrpc": "2.0", "method": method, "id": 1}
+    if params is not None:
+        body["params"] = params
+    return client.post("/rpc", json=body)
+
+
+def test_wallet_name_address_is_pinned(client):
+    assert DinariAddress.generate_from_wallet_name("alice") == ALICE_ADDRESS
+    assert rpc(client, "dinari_createWallet", ["alice"]).get_json()["result"]["address"] == ALICE_ADDRESS
+    assert client.post("/api/wallet/create", json={"name": "alice"}).get_json()["address"] == ALICE_ADDRESS
+
+
+def test_seeded_address_is_pinned(client):
+    assert DinariAddress.generate_address("alice") == ALICE_ADDRESS
+    assert rpc(client, "dinari_generateAddress", ["alice"]).get_json()["result"]["address"] == ALICE_ADDRESS
+    assert client.post("/api/address/generate", json={"seed": "alice"}).get_json()["address"] == ALICE_ADDRESS
+
+
+def test_random_addresses_differ():
+    first, second = DinariAddress.generate_address(), DinariAddress.generate_address()
+    assert first != second
+    assert DinariAddress.is_valid_address(first)
+
+
+def test_multisig_address_is_pinned():
+    assert DinariAddress.generate_multisig_address(["pk3", "pk1", "pk2"], 2) == MULTISIG_ADDRESS
+
+
+def test_address_info_copies_are_independent(client):
+    info = DinariAddress.get_address_info(ALICE_ADDRESS)
+    info["balances"] = {"DINARI": "1"}
+
+    assert "balances" not in DinariAddress.get_address_info(ALICE_ADDRESS)
+    assert "balances" not in rpc(client, "dinari_validateAddress", [ALICE_ADDRESS]).get_json()["result"]
+    assert "balances" not in client.get(f"/api/address/validate/{ALICE_ADDRESS}").get_json()
+
+
+def _start_refused():
+    return False
+
+
+def _start_crashed():
+    raise OSError("port in use")
+
+
+@pytest.mark.parametrize("start", [_start_refused, _start_crashed])
+def test_failed_p2p_start_clears_node(monkeypatch, chain, start):
+    class FakeNode:
+        def __init__(self, **kwargs):
+            pass
+
+        def set_blockchain(self, blockchain):
+            pass
+
+        def get_network_info(self):
+            return {"connected_peers": 3}
+
+        def start(self):
+            return start()
+
+    monkeypatch.setattr(api_server, "DinariBlockchain", lambda: chain)
+    monkeypatch.setattr(api_server, "DinariNode", FakeNode)
+    monkeypatch.setattr(api_server, "blockchain", None)
+    monkeypatch.setattr(api_server, "blockchain_node", None)
+    monkeypatch.setattr(api_server, "node_network_info", None)
+    monkeypatch.setattr(api_server, "contract_manager", None)
+
+    api_server.initialize_blockchain()
+
+    assert api_server.blockchain_node is None
+    assert api_server.node_network_info is None
+
+
+def test_recent_transactions_fallback_reports_real_total(monkeypatch, chain):
+    # A newer block that fills the page on its own, so the scan stops early
+    height = chain.get_chain_height()
+    newest = [{"from_address": "DTa", "to_address": "DTb", "amount": "1", "timestamp": t} for t in (1, 2)]
+    chain.db.put("block:newest", {"index": height, "hash": "newest", "transactions": newest})
+    chain.db.put(f"block_index:{height}", "newest")
+    chain.chain_state["height"] = height + 1
+    chain.chain_state["total_transactions"] += len(newest)
+    # No permanent records: the handler reads the blocks directly
+    chain.db.put("tx_count", "0")
+    monkeypatch.setattr(api_server, "blockchain", chain)
+    api_server.chain_info_cache.invalidate()
+
+    result = api_server.handle_dinari_getRecentTransactions([1])
+
+    assert len(result["transactions"]) == 1
+    assert result["total"] == chain.chain_state["total_transactions"] > 1
+    assert result["has_more"]
+    api_server.chain_info_cache.invalidate()
+
+
+@pytest.mark.parametrize("params", [["no-such-job"], [["unhashable"]], None])
+def test_mine_status_rejects_unknown_job_as_invalid_params(client, params):
+    response = rpc(client, "dinari_getMineStatus", params)
+
+    assert response.status_code == 200
+    assert response.get_json()["error"]["code"] == -32602
+
+
+def test_mine_block_rejects_jobs_when_table_full(monkeypatch, client, chain):
+    monkeypatch.setattr(api_server, "blockchain", chain)
+    monkeypatch.setattr(api_server, "_MINE_JOBS", OrderedDict((f"job{i}", Future()) for i in range(2)))
+    monkeypatch.setattr(api_server, "MAX_MINE_JOBS", 2)
+    submitted = []
+    monkeypatch.setattr(api_server._MINER_POOL, "submit", lambda *args: submitted.append(args))
+
+    response = rpc(client, "dinari_mineBlock", ["validator", False])
+
+    assert response.get_json()["error"]["code"] == -32000
+    assert not submitted
+    assert list(api_server._MINE_JOBS) == ["job0", "job1"]
+
+    api_server._MINE_JOBS["job0"].set_result({"success": True})
+    assert rpc(client, "dinari_mineBlock", ["validator", False]).get_json()["result"]["status"] == "pending"
+    assert len(submitted) == 1
+    assert "job0" not in api_server._MINE_JOBS
+
+
+def test_fee_estimates_are_fresh_per_call():
+    estimates = api_server._fee_estimates(21000)
+    estimates["standard"]["total_fee"] = "0"
+
+    assert api_server._fee_estimates(21000)["standard"]["total_fee"] == str(21000 * 2000000000)
+
+
+def test_height_cached_results_are_copies(monkeypatch, chain):
+    monkeypatch.setattr(api_server, "blockchain", chain)
+    api_server.rpc_height_cache.clear()
+
+    first = api_server.handle_dinari_getRecentBlocks([5])
+    first["success"] = False
+
+    assert api_server.handle_dinari_getRecentBlocks([5])["success"] is True
+    api_server.rpc_height_cache.clear()
+
+
+def test_find_available_port_remembers_port_without_touching_env(monkeypatch):
+    monkeypatch.setattr(api_server, "_resolved_p2p_ports", {})
+    monkeypatch.delenv("P2P_PORT_RESOLVED", raising=False)
+
+    port = api_server.find_available_port(28333)
+
+    assert api_server.find_available_port(28333) == port
+    assert api_server._resolved_p2p_ports == {28333: port}
+    assert "P2P_PORT_RESOLVED" not in os.environ
@@ -0,0 +1,102 @@
+"""
+DinariBlockchain - blockchain storage unit tests
+tests/unit/test_blockchain.py
+"""
+
+import copy
+import threading
+
+import pytest
+
+
+def _add_block(chain, block_hash, transactions):
+    """Commit a raw block at the chain tip and return its height"""
+    height = chain.get_chain_height()
+    chain.db.put(f"block:{block_hash}", {
+        "index": height,
+        "hash": block_hash,
+        "transactions": transactions,
+    })
+    chain.db.put(f"block_index:{height}", block_hash)
+    chain.chain_state["height"] = height + 1
+    return height
+
+
+def test_cached_block_unchanged_by_iteration(chain):
+    cached = chain.get_block_by_index(0)
+    before = copy.deepcopy(cached)
+
+    blocks = list(chain.iter_blocks_desc())
+
+    assert blocks[-1]["number"] == 0
+    assert chain.get_block_by_index(0) == before
+    assert "number" not in chain.get_block_by_index(0)
+
+
+def test_cached_block_unchanged_by_hash_lookup(chain):
+    tx = {"from_address": "DTa", "to_address": "DTb", "amount": "1", "hash": "DTxcached"}
+    height = _add_block(chain, "cachedblock", [tx])
+    before = copy.deepcopy(chain.get_block_by_index(height))
+
+    found = chain.get_transaction_by_hash("DTxcached")
+
+    assert found["block_hash"] == "cachedblock"
+    assert found["block_number"] == height
+    assert chain.get_block_by_index(height) == before
+
+
+def _store(chain, tx_hash, from_address, to_address, block_number=1):
+    return chain.store_transaction_permanently({
+        "hash": tx_hash,
+        "from_address": from_address,
+        "to_address": to_address,
+        "amount": "1",
+    }, block_number)
+
+
+def test_address_index_pages_newest_first(chain):
+    for i in range(5):
+        _store(chain, f"DTxpage{i}", "DTsender", f"DTrecipient{i}")
+
+    first = chain.get_address_transactions("DTsender", 0, 2)
+    rest = chain.get_address_transactions("DTsender", 2, 10)
+
+    assert first["total"] == 5
+    assert [tx["hash"] for tx in first["transactions"]] == ["DTxpage4", "DTxpage3"]
+    assert first["has_more"]
+    assert [tx["hash"] for tx in rest["transactions"]] == ["DTxpage2", "DTxpage1", "DTxpage0"]
+    assert not rest["has_more"]
+    assert chain.get_address_transactions("DTrecipient3")["transactions"][0]["direction"] == "received"
+
+
+def test_address_index_concurrent_writes_keep_every_entry(chain):
+    def store_many(worker):
+        for i in range(20):
+            _store(chain, f"DTxw{worker}_{i}", "DTbusy", f"DTpeer{worker}")
+
+    threads = [threading.Thread(target=store_many, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = chain.get_address_transactions("DTbusy", 0, 100)
+    assert history["total"] == 80
+    assert len({tx["hash"] for tx in history["transactions"]}) == 80
+
+
+def test_block_transactions_flush_file_store_once(monkeypatch, chain):
+    from Dinari.database import leveldb_storage
+
+    if chain.db.storage_type != "file":
+        pytest.skip("LevelDB writes are not rewritten per put")
+    dumps = []
+    real_dump = leveldb_storage.json.dump
+    monkeypatch.setattr(leveldb_storage.json, "dump", lambda *a, **kw: (dumps.append(1), real_dump(*a, **kw)))
+    transactions = [{"hash": f"DTxflush{i}", "from_address": "DTa", "to_address": "DTb", "amount": "1"}
+                    for i in range(3)]
+
+    assert chain.add_block_to_chain({"index": 1, "transactions": transactions})
+
+    assert len(dumps) == 1
+    assert chain.get_address_transactions("DTa")["total"] == 3